@@ -0,0 +1,117 @@
+# admin_users.py
+
+from datetime import datetime
+
+from credits import FIRESTORE_BATCH_LIMIT
+from telemetry import span
+
+ADMIN_COLUMNS = ['ip', 'credits_used', 'credit_limit', 'last_seen']
+EDITABLE_COLUMNS = ['credits_used', 'credit_limit']
+
+
+class AdminUserPager:
+    """Cursor-paginated, filtered view of the `users` collection for the admin panel.
+
+    Only one page of documents is read at a time (`order_by` descending, optionally
+    restricted to values >= `min_value` on the same field, as Firestore requires).
+    The loaded page is kept as a snapshot: `refresh` re-reads only documents whose
+    `last_seen` moved past the snapshot time, and `save` writes only rows that differ
+    from it, in chunks that fit a Firestore batch.
+    """
+
+    def __init__(self, db, order_by="last_seen", min_value=None, page_size=50, default_limit=0, collection="users"):
+        self.db = db
+        self.order_by = order_by
+        self.min_value = min_value
+        self.page_size = page_size
+        self.default_limit = default_limit
+        self.collection = collection
+        self.page = 0
+        self.has_next = False
+        self.snapshot = {}          # ip -> row, in page order
+        self._page_starts = [None]  # start_after document for each visited page
+        self._last_doc = None
+        self._loaded_at = None
+
+    def _query(self):
+        from firebase_admin import firestore
+        query = self.db.collection(self.collection)
+        if self.min_value is not None:
+            query = query.where(filter=firestore.FieldFilter(self.order_by, ">=", self.min_value))
+        return query.order_by(self.order_by, direction=firestore.Query.DESCENDING)
+
+    def load(self):
+        query = self._query()
+        if self._page_starts[self.page] is not None: query = query.start_after(self._page_starts[self.page])
+        with span("firestore.admin_page"): docs = list(query.limit(self.page_size + 1).stream())
+        self.has_next = len(docs) > self.page_size
+        docs = docs[:self.page_size]
+        self._last_doc = docs[-1] if docs else None
+        self.snapshot = {doc.id: self._row(doc) for doc in docs}
+        self._loaded_at = datetime.now().isoformat()
+        return self.rows()
+
+    def rows(self):
+        return list(self.snapshot.values())
+
+    def next_page(self):
+        if not self.has_next: return self.rows()
+        del self._page_starts[self.page + 1:]
+        self._page_starts.append(self._last_doc)
+        self.page += 1
+        return self.load()
+
+    def prev_page(self):
+        if self.page == 0: return self.rows()
+        self.page -= 1
+        return self.load()
+
+    def refresh(self):
+        """Patch the snapshot with users whose documents changed since it was loaded.
+
+        Returns how many changed users are not on this page (their position in the
+        ordering may have moved, so the caller can offer a full reload).
+        """
+        from firebase_admin import firestore
+        if self._loaded_at is None: self.load(); return 0
+        since, self._loaded_at = self._loaded_at, datetime.now().isoformat()
+        with span("firestore.admin_refresh"): changed = list(self.db.collection(self.collection).where(filter=firestore.FieldFilter("last_seen", ">", since)).stream())
+        elsewhere = 0
+        for doc in changed:
+            if doc.id in self.snapshot: self.snapshot[doc.id] = self._row(doc)
+            else: elsewhere += 1
+        return elsewhere
+
+    def changed_rows(self, edited_rows):
+        changes = {}
+        for row in edited_rows:
+            original = self.snapshot.get(row['ip'])
+            if original is None: continue
+            updates = {}
+            for column in EDITABLE_COLUMNS:
+                value = row[column]
+                if value is None or value != value: continue  # Cleared cell (None/NaN): keep the stored value
+                if int(value) != original[column]: updates[column] = int(value)
+            if updates: changes[row['ip']] = updates
+        return changes
+
+    def save(self, edited_rows):
+        """Write only the edited cells; returns the IPs that were updated."""
+        changes = self.changed_rows(edited_rows)
+        items = list(changes.items())
+        for i in range(0, len(items), FIRESTORE_BATCH_LIMIT):
+            batch = self.db.batch()
+            for ip, updates in items[i:i + FIRESTORE_BATCH_LIMIT]:
+                batch.update(self.db.collection(self.collection).document(ip), updates)
+            with span("firestore.admin_save"): batch.commit()
+        for ip, updates in items: self.snapshot[ip].update(updates)
+        return list(changes)
+
+    def _row(self, doc):
+        data = doc.to_dict()
+        return {'ip': doc.id, 'credits_used': int(data.get('credits_used', 0)), 'credit_limit': int(data.get('credit_limit', self.default_limit)), 'last_seen': data.get('last_seen', "")}
+
+
+def count_users(db, collection="users"):
+    # Aggregation query: billed per 1000 index entries rather than per document
+    with span("firestore.user_count"): return db.collection(collection).count().get()[0][0].value
@@ -0,0 +1,59 @@
+# analysis_cache.py
+
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+from concurrent.futures import Future
+
+from telemetry import count
+
+
+def normalize_job_desc(job_desc):
+    # Re-scrapes of the same posting differ only in whitespace and unicode forms
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", job_desc or "")).strip()
+
+
+def analysis_key(job_desc, resume_text, model, prompt_version):
+    payload = json.dumps([normalize_job_desc(job_desc), (resume_text or "").strip(), model, prompt_version], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """Content-addressed cache for LLM analysis results with in-flight dedup.
+
+    Results live in a persistent store (a DiskCache, which handles TTL and LRU
+    eviction). Concurrent callers asking for the same key while it is being
+    computed wait for the one running call instead of starting their own.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def get_or_compute(self, key, compute, cacheable=lambda result: True):
+        cached = self.store.get(key)
+        if cached is not None: count("analysis_cache.hit"); return cached
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader: future = self._in_flight[key] = Future()
+        if not is_leader:
+            count("analysis_cache.shared")
+            return dict(future.result())
+        try:
+            # Another leader may have stored the result between our read and taking the lock
+            result = self.store.get(key)
+            if result is None:
+                count("analysis_cache.miss")
+                result = compute()
+                if cacheable(result): self.store.set(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock: self._in_flight.pop(key, None)
@@ -0,0 +1,81 @@
+# analysis_worker.py
+
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorker:
+    """Process-wide analysis queue that outlives individual Streamlit script runs.
+
+    A batch is a list of job rows analysed by `analyze(job_row, report_progress)` on a
+    shared thread pool; `report_progress(partial)` publishes intermediate output that
+    pollers see as the task's 'partial' until its result is in. Status and results stay
+    in memory under the batch ID, so any rerun or new session that holds the ID can
+    poll the batch instead of starting the work again. The ID is unguessable and is
+    the only way to reach a batch; `owner` is informational (e.g. for accounting).
+    `on_complete(batch)` runs exactly once, on the worker thread, after the last job
+    of a batch finishes.
+    """
+
+    def __init__(self, max_workers=8, retention_seconds=6 * 3600):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-worker")
+        self._lock = threading.Lock()
+        self._batches = {}
+
+    def submit_batch(self, owner, jobs, analyze, on_complete=None):
+        batch_id = uuid.uuid4().hex
+        tasks = {job['job_id']: {'job': dict(job), 'status': 'pending', 'result': None, 'partial': None} for job in jobs}
+        with self._lock:
+            self._purge_expired()
+            self._batches[batch_id] = {'batch_id': batch_id, 'owner': owner, 'created_at': time.time(), 'finished_at': None if tasks else time.time(),
+                                       'tasks': tasks, 'remaining': len(tasks), 'on_complete': on_complete}
+        for job_id, task in tasks.items():
+            # Each job runs in a copy of the submitter's context (e.g. its telemetry request ID)
+            self._executor.submit(contextvars.copy_context().run, self._run, batch_id, job_id, analyze, task['job'])
+        return batch_id
+
+    def get_batch(self, batch_id):
+        # Returns a snapshot that callers may read freely while workers keep updating the store
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None: return None
+            tasks = [{'job': task['job'], 'status': task['status'], 'result': task['result'], 'partial': task['partial']} for task in batch['tasks'].values()]
+            return {'batch_id': batch_id, 'owner': batch['owner'], 'created_at': batch['created_at'], 'finished_at': batch['finished_at'],
+                    'done': batch['finished_at'] is not None, 'tasks': tasks}
+
+    def _run(self, batch_id, job_id, analyze, job):
+        self._set_status(batch_id, job_id, 'running')
+        def report_progress(partial):
+            with self._lock: self._batches[batch_id]['tasks'][job_id]['partial'] = partial
+        try:
+            result = analyze(job, report_progress)
+        except Exception as exc:
+            result = {"status": "error", "match_analysis": f"Critical error: {exc}"}
+        with self._lock:
+            batch = self._batches[batch_id]
+            batch['tasks'][job_id].update(status='done', result=result)
+            batch['remaining'] -= 1
+            if batch['remaining'] > 0: return
+        # The batch only reports done once on_complete (e.g. charging credits) has run
+        if batch['on_complete'] is not None:
+            try:
+                batch['on_complete'](self.get_batch(batch_id))
+            except Exception:
+                logger.exception("on_complete failed for analysis batch %s", batch_id)
+        with self._lock: batch['finished_at'] = time.time()
+
+    def _set_status(self, batch_id, job_id, status):
+        with self._lock: self._batches[batch_id]['tasks'][job_id]['status'] = status
+
+    def _purge_expired(self):
+        # Called with the lock held; only finished batches are ever dropped
+        cutoff = time.time() - self.retention_seconds
+        for batch_id in [b_id for b_id, batch in self._batches.items() if batch['finished_at'] and batch['finished_at'] < cutoff]:
+            del self._batches[batch_id]
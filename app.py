@@ -1,178 +1,136 @@
 # app.py
 
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
 import time
-import random
-import pandas as pd
-import re
-import PyPDF2
 import os
-import groq
-import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
-from datetime import datetime
 from streamlit.web.server.server import Server
-
-# --- NEW: Firebase Admin SDK Imports ---
-import firebase_admin
-from firebase_admin import credentials, firestore
+from analysis_cache import AnalysisCache
+from admin_users import ADMIN_COLUMNS, AdminUserPager, count_users
+from analysis_worker import AnalysisWorker
+from credits import CreditService, FirestoreCreditStore, InMemoryCreditStore
+from deep_analysis import run_cached_analysis
+from disk_cache import DiskCache
+from job_store import JobStore
+from resume_ingest import ResumeIngestor
+from telemetry import TELEMETRY, new_request_id, request_context, span
+# Heavy libraries (pandas, PyPDF2, groq, firebase_admin, bs4/lxml, httpx) are imported
+# where they are first needed, so the first page renders without loading them all
 
 # --- App Configuration ---
 st.set_page_config(page_title="Job Lens AI - Career Co-Pilot", layout="wide")
 
-# --- NEW: Firebase Initialization ---
-try:
-    firebase_creds = dict(st.secrets.firebase_service_account)
-    firebase_creds["private_key"] = firebase_creds["private_key"].replace('\\n', '\n')
-    cred = credentials.Certificate(firebase_creds)
-    firebase_admin.initialize_app(cred)
-except ValueError:
-    pass
+# --- NEW: Firebase Initialization, once per process ---
+@st.cache_resource
+def get_firestore_client():
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+    try:
+        firebase_creds = dict(st.secrets.firebase_service_account)
+        firebase_creds["private_key"] = firebase_creds["private_key"].replace('\\n', '\n')
+        cred = credentials.Certificate(firebase_creds)
+        firebase_admin.initialize_app(cred)
+    except ValueError:
+        pass
+    return firestore.client()
 
-db = firestore.client()
+# --- NEW: Persistent job-posting cache, shared by all sessions and restarts ---
+JOB_CACHE_PATH = os.environ.get("JOBLENS_CACHE_PATH", "joblens_cache.sqlite3")
+JOB_CACHE_TTL_HOURS = float(os.environ.get("JOBLENS_JOB_CACHE_TTL_HOURS", 6))
+JOB_CACHE_MAX_ENTRIES = int(os.environ.get("JOBLENS_JOB_CACHE_MAX_ENTRIES", 20000))
 
-# --- All Helper & Scraping Functions (UNCHANGED) ---
-@st.cache_data
-def parse_time_posted(time_text):
-    if not time_text: return None
-    num_match = re.search(r'\d+', time_text)
-    if not num_match: return None
-    num = int(num_match.group(0))
-    time_text = time_text.lower()
-    if 'second' in time_text or 'minute' in time_text or 'hour' in time_text: return 0
-    elif 'day' in time_text: return num * 24
-    elif 'week' in time_text: return num * 7 * 24
-    elif 'month' in time_text: return num * 30 * 24
-    else: return None
+@st.cache_resource
+def get_job_cache():
+    return DiskCache(JOB_CACHE_PATH, "job_posts", ttl_seconds=JOB_CACHE_TTL_HOURS * 3600, max_entries=JOB_CACHE_MAX_ENTRIES)
 
-@st.cache_data
-def parse_num_applicants(applicant_text):
-    if not applicant_text: return None
-    num_match = re.search(r'\d+', applicant_text)
-    if num_match: return int(num_match.group(0))
-    else: return None
+# --- NEW: Process-wide job store; sessions keep only the job IDs of their search ---
+@st.cache_resource
+def get_job_store():
+    return JobStore(max_jobs=int(os.environ.get("JOBLENS_JOB_STORE_MAX_JOBS", 20000)))
+
+# --- NEW: Persistent cache of LLM analysis results, keyed by content hash ---
+ANALYSIS_CACHE_TTL_HOURS = float(os.environ.get("JOBLENS_ANALYSIS_CACHE_TTL_HOURS", 72))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get("JOBLENS_ANALYSIS_CACHE_MAX_ENTRIES", 5000))
+
+@st.cache_resource
+def get_analysis_cache():
+    return AnalysisCache(DiskCache(JOB_CACHE_PATH, "analyses", ttl_seconds=ANALYSIS_CACHE_TTL_HOURS * 3600, max_entries=ANALYSIS_CACHE_MAX_ENTRIES))
+
+# --- NEW: Shared async HTTP engine (keep-alive pool, per-host rate limit, adaptive concurrency) ---
+LINKEDIN_API_BASE = os.environ.get("JOBLENS_LINKEDIN_BASE_URL", "https://www.linkedin.com")
+GROQ_BASE_URL = os.environ.get("JOBLENS_GROQ_BASE_URL")  # e.g. benchmarks/fake_groq.py; None uses the Groq API
+
+@st.cache_resource
+def get_http_engine():
+    from http_engine import DEFAULT_MAX_CONCURRENCY, DEFAULT_REQUESTS_PER_SECOND, HttpEngine
+    return HttpEngine(requests_per_second=float(os.environ.get("JOBLENS_LINKEDIN_RPS", DEFAULT_REQUESTS_PER_SECOND)), max_concurrency=int(os.environ.get("JOBLENS_LINKEDIN_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+
+# --- NEW: Per-stage spans and counters are always recorded in memory; file and Prometheus export are opt-in ---
+@st.cache_resource
+def start_telemetry_export():
+    if os.environ.get("JOBLENS_TRACE_JSONL"): TELEMETRY.start_jsonl_export(os.environ["JOBLENS_TRACE_JSONL"])
+    if os.environ.get("JOBLENS_METRICS_PORT"): TELEMETRY.serve_prometheus(int(os.environ["JOBLENS_METRICS_PORT"]))
+    return TELEMETRY
 
-def read_pdf(file):
+start_telemetry_export()
+
+# --- NEW: One Groq client (and its keep-alive connection pool) for all sessions ---
+@st.cache_resource
+def get_groq_client():
+    import groq
+    try: api_key = st.secrets["GROQ_API_KEY"]
+    except (FileNotFoundError, KeyError): api_key = None
+    return groq.Groq(api_key=api_key, base_url=GROQ_BASE_URL)
+
+# --- NEW: Resumes are parsed once per content hash (in-memory LRU shared by all sessions) ---
+@st.cache_resource
+def get_resume_ingestor():
+    return ResumeIngestor(max_entries=int(os.environ.get("JOBLENS_RESUME_CACHE_MAX_ENTRIES", 256)))
+
+def load_resume(data, is_pdf):
+    # Stores the normalized text and its token profile (reused by ranking) in the session
     try:
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages: text += page.extract_text() or ""
-        return text
+        parsed = get_resume_ingestor().ingest(data, is_pdf)
     except Exception as e:
-        st.error(f"Error reading PDF file: {e}")
-        return ""
+        st.error(f"Error reading {'PDF' if is_pdf else 'resume'} file: {e}")
+        st.session_state['resume_text'], st.session_state['resume_profile'] = "", None
+        return
+    st.session_state['resume_text'], st.session_state['resume_profile'] = parsed.text, parsed.profile
+
+# --- All Helper & Scraping Functions (UNCHANGED) ---
 
 @st.cache_data
 def convert_df_to_csv(df):
     return df.to_csv(index=False).encode('utf-8')
 
-def fetch_job_details(job_id):
-    try:
-        job_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-        job_response = requests.get(job_url, timeout=15)
-        job_response.raise_for_status()
-        job_soup = BeautifulSoup(job_response.text, "html.parser")
-        salary_raw = None
-        try:
-            insights = job_soup.find_all("li", {"class": "job-details-jobs-unified-top-card__job-insight"})
-            for insight in insights:
-                if "💰" in insight.get_text():
-                    salary_raw = insight.find("span").text.strip()
-                    break
-        except: pass
-        job_post = {
-            'job_id': job_id, 'job_link': f"https://www.linkedin.com/jobs/view/{job_id}",
-            'job_title': job_soup.find("h2", {"class":"top-card-layout__title"}).text.strip() if job_soup.find("h2", {"class":"top-card-layout__title"}) else "N/A",
-            'company_name': job_soup.find("a", {"class": "topcard__org-name-link"}).text.strip() if job_soup.find("a", {"class": "topcard__org-name-link"}) else "N/A",
-            'salary': salary_raw,
-            'job_desc': job_soup.find("div", {"class": "show-more-less-html__markup"}).get_text(separator="\n").strip() if job_soup.find("div", {"class": "show-more-less-html__markup"}) else "",
-            'hours_posted': parse_time_posted(job_soup.find("span", {"class": "posted-time-ago__text"}).text.strip() if job_soup.find("span", {"class": "posted-time-ago__text"}) else None),
-            'applicants_count': parse_num_applicants(job_soup.find("span", {"class": "num-applicants__caption"}).text.strip() if job_soup.find("span", {"class": "num-applicants__caption"}) else None)
-        }
-        return job_post
-    except requests.exceptions.RequestException:
-        return None
-
 def run_linkedin_scraper(title, location, num_pages):
-    # This function remains unchanged, it already uses parallel processing well.
-    id_list, start, count = [], 0, 0
+    import pandas as pd
+    from linkedin_scraper import stream_linkedin_jobs
+    job_list, pages_done, ids_found, jobs_done, last_render = [], 0, 0, 0, 0.0
     status_text = st.empty()
     progress_bar = st.progress(0, text="Scraping progress")
-    status_text.text("Part 1/2: Collecting Job IDs...")
-    while count < num_pages:
-        list_url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={title}&location={location}&start={start}"
-        try:
-            response = requests.get(list_url, timeout=10)
-            response.raise_for_status()
-            list_soup = BeautifulSoup(response.text, "html.parser")
-            page_jobs = list_soup.find_all("li")
-            if not page_jobs: break
-            for job in page_jobs:
-                job_id = job.find("div", {"class": "base-card"}).get("data-entity-urn", "").split(":")[-1]
-                if job_id and job_id not in id_list: id_list.append(job_id)
-            count += 1
-            start += 25
-            status_text.text(f"Part 1/2: Collecting Job IDs... Found {len(id_list)} IDs across {count} page(s).")
-            progress_bar.progress(count / num_pages)
-            time.sleep(random.uniform(0.5, 1.5))
-        except requests.exceptions.RequestException as e:
-            st.warning(f"Failed to fetch a job list page. Stopping ID collection. Error: {e}")
-            break
-    if not id_list: return None
-    job_list = []
-    total_ids = len(id_list)
-    status_text.text(f"Part 2/2: Scraping details for {total_ids} jobs...")
-    progress_bar.progress(0)
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_id = {executor.submit(fetch_job_details, job_id): job_id for job_id in id_list}
-        for i, future in enumerate(as_completed(future_to_id)):
-            result = future.result()
-            if result: job_list.append(result)
-            progress = (i + 1) / total_ids
-            status_text.text(f"Part 2/2: Scraping details... Job {i+1}/{total_ids}")
-            progress_bar.progress(progress)
+    live_table = st.empty()
+    status_text.text("Collecting job IDs...")
+    with request_context(new_request_id("search")), span("search.total"):
+        for event in stream_linkedin_jobs(title, location, num_pages, get_http_engine(), get_job_cache(), LINKEDIN_API_BASE):
+            if event[0] == 'page': _, pages_done, ids_found = event
+            elif event[0] == 'job':
+                jobs_done += 1
+                if event[1]: job_list.append(event[1])
+            elif event[0] == 'error': st.warning(f"Failed to fetch a job list page. Stopping ID collection. Error: {event[1]}")
+            status_text.text(f"Scanned {pages_done}/{num_pages} page(s), {ids_found} IDs found. Job details ready: {jobs_done}/{ids_found}")
+            # Details are measured against the IDs the remaining pages should add too, so the bar doesn't fall back as pages arrive
+            expected_ids = max(ids_found, ids_found * num_pages // max(pages_done, 1))
+            progress_bar.progress(min(1.0, (pages_done / num_pages + jobs_done / max(expected_ids, 1)) / 2))
+            # Show rows as they finish, throttled so a large scan doesn't re-send the table per job
+            if job_list and time.monotonic() - last_render > 0.5:
+                live_table.dataframe(pd.DataFrame(job_list), hide_index=True, column_config={"job_id": None})
+                last_render = time.monotonic()
     status_text.empty()
     progress_bar.empty()
-    return pd.DataFrame(job_list) if job_list else None
-
-def escape_latex(text: str) -> str:
-    if not isinstance(text, str): return ""
-    return text.replace('\\', r'\textbackslash{}').replace('{', r'\{').replace('}', r'\}').replace('&', r'\&').replace('%', r'\%').replace('$', r'\$').replace('#', r'\#').replace('_', r'\_').replace('~', r'\textasciitilde{}').replace('^', r'\textasciicircum{}')
-
-def run_deep_analysis(client, job_desc, resume_text):
-    # This function remains unchanged, it now returns a status for error handling.
-    latex_template = r"""\documentclass[a4paper,11pt]{article}
-\usepackage[T1]{fontenc}
-\usepackage{geometry}
-\geometry{a4paper, total={170mm,257mm}, left=20mm, top=20mm}
-\usepackage{enumitem}
-\setlist[itemize]{leftmargin=*}
-\linespread{1.15}
-\begin{document}
-%s
-\end{document}
-"""
-    prompt = f"""You are an expert career coach and LaTeX resume formatter... (rest of prompt is unchanged)"""
-    last_exception = None
-    for attempt in range(2):
-        try:
-            response = client.chat.completions.create(model="llama-3.1-8b-instant", messages=[{"role": "system", "content": "You are a career coach. Respond with a single, valid JSON object and nothing else."}, {"role": "user", "content": prompt}], temperature=0.4, timeout=90.0)
-            analysis_json = json.loads(response.choices[0].message.content)
-            resume_content = analysis_json.get('updated_resume_content', 'Error: Content not generated.')
-            cover_letter_content = analysis_json.get('cover_letter_content', 'Error: Content not generated.')
-            analysis_json['updated_resume_latex'] = latex_template % escape_latex(resume_content)
-            analysis_json['cover_letter_latex'] = latex_template % escape_latex(cover_letter_content)
-            analysis_json['status'] = 'success'
-            return analysis_json
-        except Exception as e:
-            last_exception = e
-            time.sleep(1)
-    return {"status": "error", "match_analysis": f"An error occurred during analysis after multiple retries. Details: {str(last_exception)}"}
-
-# --- Credit System & User Functions (UNCHANGED) ---
+    live_table.empty()
+    return get_job_store().add(job_list) if job_list else None
+
+# --- Credit System & User Functions ---
 DEFAULT_CREDIT_LIMIT = 50
 def get_user_ip():
     try:
@@ -180,45 +138,69 @@ def get_user_ip():
         if session_info: return session_info.ws.request.remote_ip
     except Exception: return "local_user"
     return "unknown_user"
-def get_user_data(ip):
-    user_ref = db.collection('users').document(ip)
-    user_doc = user_ref.get()
-    if user_doc.exists:
-        user_data = user_doc.to_dict(); user_data.setdefault("credit_limit", DEFAULT_CREDIT_LIMIT); return user_data
-    else:
-        default_data = {"credits_used": 0, "credit_limit": DEFAULT_CREDIT_LIMIT, "last_seen": datetime.now().isoformat()}
-        user_ref.set(default_data); return default_data
-@firestore.transactional
-def update_user_credits_transactional(transaction, user_ref, credits_to_add):
-    snapshot = user_ref.get(transaction=transaction)
-    new_credits_used = snapshot.get('credits_used') + credits_to_add
-    transaction.update(user_ref, {'credits_used': new_credits_used, 'last_seen': datetime.now().isoformat()})
-def update_user_credits(ip, credits_to_add):
-    if credits_to_add > 0:
-        user_ref = db.collection('users').document(ip); update_user_credits_transactional(db.transaction(), user_ref, credits_to_add)
-def get_all_user_data_for_admin():
-    docs = db.collection('users').stream()
-    return [{'ip': doc.id, **doc.to_dict()} for doc in docs]
-def save_admin_credit_changes(edited_df):
-    batch = db.batch()
-    for _, row in edited_df.iterrows():
-        user_ref = db.collection('users').document(row["ip"])
-        batch.update(user_ref, {"credits_used": int(row["credits_used"]), "credit_limit": int(row["credit_limit"])})
-    batch.commit()
+# --- NEW: Cached, write-behind credit accounting (one Firestore read per TTL, batched usage writes) ---
+CREDIT_STORE = os.environ.get("JOBLENS_CREDIT_STORE", "firestore")
+@st.cache_resource
+def get_credit_service():
+    # JOBLENS_CREDIT_STORE=memory keeps credits in this process only (local runs, benchmarks); no Firebase needed
+    store = InMemoryCreditStore(DEFAULT_CREDIT_LIMIT) if CREDIT_STORE == "memory" else FirestoreCreditStore(get_firestore_client(), DEFAULT_CREDIT_LIMIT)
+    return CreditService(store, ttl_seconds=float(os.environ.get("JOBLENS_CREDIT_CACHE_TTL_SECONDS", 30)), flush_interval=float(os.environ.get("JOBLENS_CREDIT_FLUSH_SECONDS", 2)))
+@st.cache_data(ttl=60)
+def count_all_users():
+    return count_users(get_firestore_client())
 
 # --- App State Initialization ---
-try: api_key = st.secrets["GROQ_API_KEY"]
-except (FileNotFoundError, KeyError): api_key = None
 user_ip = get_user_ip()
-user_data = get_user_data(user_ip)
-credits_left = user_data.get("credit_limit", DEFAULT_CREDIT_LIMIT) - user_data.get("credits_used", 0)
+credit_service = get_credit_service()
+user_data = credit_service.get_user(user_ip)
+credits_left = credit_service.credits_left(user_ip)
+
+# --- NEW: Background analysis worker, shared by all sessions and independent of script reruns ---
+@st.cache_resource
+def get_analysis_worker():
+    return AnalysisWorker(max_workers=8)
+
+def submit_analysis_batch(ip, jobs, resume_text):
+    # Credits are reserved up front so concurrent sessions can't overspend; returns None if they can't be
+    with request_context(new_request_id("analysis")):
+        client = get_groq_client()  # Before reserving, so a missing API key can't leave credits held
+        reserved = len(jobs)
+        if not credit_service.reserve(ip, reserved): return None
+        analysis_cache = get_analysis_cache()
+        # The worker keeps tasks for hours, so they hold only what the results page shows;
+        # each description goes to its analysis and is dropped once that starts
+        descriptions = {job['job_id']: job['job_desc'] for job in jobs}
+        def analyze(job, report_progress):
+            job_desc = descriptions.pop(job['job_id'])
+            with span("analysis.job"): return run_cached_analysis(client, job_desc, resume_text, analysis_cache, on_update=report_progress)
+        def charge_credits(batch):
+            # Truncated replies (resume or cover letter possibly missing) are shown but not charged
+            used = sum(task['result'].get('status') == 'success' and not task['result'].get('truncated') for task in batch['tasks'])
+            credit_service.settle(ip, reserved=reserved, used=used)
+        display_jobs = [{'job_id': job['job_id'], 'job_title': job['job_title'], 'company_name': job['company_name']} for job in jobs]
+        return get_analysis_worker().submit_batch(ip, display_jobs, analyze, on_complete=charge_credits)
+
+# Reattach to this browser's analysis after a refresh. The batch ID lives in the page URL, so it is
+# never shared between visitors the way an IP can be (NAT, or the "local_user" fallback)
+if 'analysis_batch_id' not in st.session_state and "batch" in st.query_params:
+    if get_analysis_worker().get_batch(st.query_params["batch"]) is not None:
+        st.session_state.analysis_batch_id = st.query_params["batch"]
+        st.session_state.analysis_running = True
+    else:
+        del st.query_params["batch"]
 
 # --- MODIFIED: reset_flow now clears new dynamic analysis keys ---
 def reset_flow():
-    keys_to_delete = ['scraped_df', 'successful_analyses', 'failed_analyses', 'analysis_running', 'jobs_to_analyze']
+    keys_to_delete = ['scraped_job_ids', 'job_relevance', 'successful_analyses', 'failed_analyses', 'analysis_running', 'analysis_batch_id']
     for key in keys_to_delete:
         if key in st.session_state:
             del st.session_state[key]
+    if "batch" in st.query_params: del st.query_params["batch"]
+
+# Session results hold only job IDs; titles and companies are read back from the job store
+def with_job_details(results):
+    details = {job['job_id']: job for job in get_job_store().records([result['job_id'] for result in results], fields=["job_id", "job_title", "company_name"])}
+    return [{'job_title': "N/A", 'company_name': "N/A", **details.get(result['job_id'], {}), **result} for result in results]
 
 # --- NEW: Helper function to display results to avoid code duplication ---
 def display_result_in_container(container, result):
@@ -227,6 +209,7 @@ def display_result_in_container(container, result):
             st.metric("Resume Match Score", f"{result['analysis'].get('resume_match_score', 0)}%")
             st.write("**Match Analysis:**")
             st.write(result['analysis'].get('match_analysis', 'N/A'))
+            if result['analysis'].get('truncated'): st.warning("The AI response was cut off, so the resume or cover letter below may be incomplete. No credit was charged for this job.")
             tab1, tab2 = st.tabs(["Tailored Resume (LaTeX)", "Cover Letter (LaTeX)"])
             with tab1: st.code(result['analysis'].get('updated_resume_latex', 'Error'), language='latex')
             with tab2: st.code(result['analysis'].get('cover_letter_latex', 'Error'), language='latex')
@@ -234,6 +217,15 @@ def display_result_in_container(container, result):
         with container.expander(f"⚠️ **{result['job_title']}** at {result['company_name']}", expanded=True):
             st.error(f"**Reason for failure:** {result['analysis'].get('match_analysis', 'Unknown error.')}")
 
+# Shows the fields streamed so far for a job that is still being analyzed
+def display_partial_result(container, job, partial):
+    with container.expander(f"**{job['job_title']}** at {job['company_name']}", expanded=True):
+        if 'resume_match_score' in partial: st.metric("Resume Match Score", f"{partial['resume_match_score']}%")
+        if 'match_analysis' in partial:
+            st.write("**Match Analysis:**")
+            st.write(partial['match_analysis'])
+        st.status("Writing your tailored resume and cover letter...", state="running")
+
 # --- Main App UI ---
 st.title("🤖 Job Lens AI - Career Co-Pilot")
 
@@ -244,10 +236,10 @@ with st.sidebar:
     resume_option = st.radio("Resume Input Method:", ("Paste Text", "Upload File"), key="resume_option", on_change=reset_flow)
     if resume_option == "Paste Text":
         resume_text_input = st.text_area("Paste your resume content here:", height=300, key="resume_paste", on_change=reset_flow)
-        if resume_text_input: st.session_state['resume_text'] = resume_text_input
+        if resume_text_input: load_resume(resume_text_input.encode("utf-8"), is_pdf=False)
     else:
         uploaded_file = st.file_uploader("Upload Resume", type=['txt', 'pdf'], key="upload", on_change=reset_flow)
-        if uploaded_file: st.session_state['resume_text'] = read_pdf(uploaded_file) if uploaded_file.type == "application/pdf" else uploaded_file.getvalue().decode("utf-8")
+        if uploaded_file: load_resume(uploaded_file.getvalue(), is_pdf=uploaded_file.type == "application/pdf")
     
     if 'resume_text' in st.session_state and st.session_state.get('resume_text'):
         st.success("✅ Resume Loaded & Ready for Analysis")
@@ -260,20 +252,72 @@ with st.sidebar:
     st.caption("Initial search is free. Analysis costs 1 credit per job.")
     is_admin = st.query_params.get("admin") == "true"
     if is_admin:
+        import pandas as pd
         with st.expander("👑 Admin Panel"):
-            user_list = get_all_user_data_for_admin()
-            if user_list:
-                df = pd.DataFrame(user_list)[['ip', 'credits_used', 'credit_limit', 'last_seen']]
-                edited_df = st.data_editor(df, column_config={"ip": st.column_config.TextColumn("User IP", disabled=True), "credits_used": st.column_config.NumberColumn("Credits Used", min_value=0, step=1), "credit_limit": st.column_config.NumberColumn("Credit Limit", min_value=0, step=1), "last_seen": st.column_config.TextColumn("Last Seen", disabled=True)}, num_rows="dynamic", use_container_width=True)
-                if st.button("Save Credit Changes"):
-                    save_admin_credit_changes(edited_df)
-                    st.success("User credits saved to Firestore!"); time.sleep(1); st.rerun()
-            else: st.write("No user data found in Firestore.")
+            if CREDIT_STORE == "memory":
+                # The user pager reads Firestore directly; there is nothing to manage without it
+                st.info("User management needs the Firestore credit store (JOBLENS_CREDIT_STORE is 'memory').")
+            else:
+                # NEW: One cursor-paginated page of users at a time; saves write only the edited cells
+                sort_label = st.selectbox("Sort by", ["Last seen", "Credits used"], key="admin_sort")
+                if sort_label == "Credits used":
+                    order_by, min_value = "credits_used", st.number_input("Min credits used", 0, step=1, key="admin_min_credits") or None
+                else:
+                    seen_since = st.date_input("Seen since", value=None, key="admin_seen_since")
+                    order_by, min_value = "last_seen", seen_since.isoformat() if seen_since else None
+                pager = st.session_state.get('admin_pager')
+                if pager is None or (pager.order_by, pager.min_value) != (order_by, min_value):
+                    credit_service.flush()  # Make pending usage visible before the admin edits absolute values
+                    pager = st.session_state.admin_pager = AdminUserPager(get_firestore_client(), order_by, min_value, default_limit=DEFAULT_CREDIT_LIMIT)
+                    pager.load()
+                    st.session_state.admin_changed_elsewhere = 0
+                def refresh_admin_page(pager):
+                    credit_service.flush()
+                    st.session_state.admin_changed_elsewhere = pager.refresh()
+                # Callbacks run before this script, so the buttons below are drawn from the page they lead to
+                nav_prev, nav_refresh, nav_next = st.columns(3)
+                nav_prev.button("◀", disabled=pager.page == 0, key="admin_prev", on_click=pager.prev_page)
+                nav_refresh.button("🔄", help="Pull in changes since this page was loaded", key="admin_refresh", on_click=refresh_admin_page, args=(pager,))
+                nav_next.button("▶", disabled=not pager.has_next, key="admin_next", on_click=pager.next_page)
+                st.caption(f"Page {pager.page + 1} · {count_all_users()} users in total")
+                if st.session_state.get('admin_changed_elsewhere'):
+                    st.caption(f"{st.session_state.admin_changed_elsewhere} users on other pages changed since this page was loaded.")
+                if pager.snapshot:
+                    df = pd.DataFrame(pager.rows(), columns=ADMIN_COLUMNS)
+                    edited_df = st.data_editor(df, column_config={"ip": st.column_config.TextColumn("User IP", disabled=True), "credits_used": st.column_config.NumberColumn("Credits Used", min_value=0, step=1), "credit_limit": st.column_config.NumberColumn("Credit Limit", min_value=0, step=1), "last_seen": st.column_config.TextColumn("Last Seen", disabled=True)}, use_container_width=True, key=f"admin_editor_{order_by}_{pager.page}")
+                    if st.button("Save Credit Changes"):
+                        updated_ips = pager.save(edited_df.to_dict(orient='records'))
+                        for ip in updated_ips: credit_service.invalidate(ip)
+                        st.success(f"Saved changes for {len(updated_ips)} user(s) to Firestore!"); time.sleep(1); st.rerun()
+                else: st.write("No user data found in Firestore.")
+        with st.expander("📈 Performance"):
+            # NEW: Live per-stage latency from the in-process telemetry ring buffer
+            window_label = st.selectbox("Window", ["Last 5 minutes", "Last hour", "Everything buffered"], key="admin_metrics_window")
+            window_seconds = {"Last 5 minutes": 300, "Last hour": 3600}.get(window_label)
+
+            @st.fragment(run_every=2.0)
+            def show_stage_metrics():
+                summary = TELEMETRY.stage_summary(window_seconds)
+                if not summary:
+                    st.caption("No spans recorded in this window yet."); return
+                st.dataframe(pd.DataFrame.from_dict(summary, orient="index"), use_container_width=True)
+                stage = st.selectbox("Latency histogram for", list(summary), key="admin_metrics_stage")
+                st.bar_chart(pd.DataFrame(TELEMETRY.histogram(stage, window_seconds), columns=["latency", "spans"]), x="latency", y="spans", sort=False)
+                counters = TELEMETRY.counters()
+                if counters: st.dataframe(pd.Series(counters, name="count").sort_index(), use_container_width=True)
+                recent = TELEMETRY.requests(limit=10)
+                if recent:
+                    st.caption("Recent searches and analyses (seconds per stage)")
+                    st.dataframe(pd.DataFrame([{"request": r['request_id'], "wall_s": round(r['seconds'], 2), **{k: round(v, 2) for k, v in r['stages'].items()}} for r in recent]), hide_index=True, use_container_width=True)
+            show_stage_metrics()
+            col_prom, col_jsonl = st.columns(2)
+            col_prom.download_button("Prometheus text", TELEMETRY.to_prometheus, file_name="joblens_metrics.prom", mime="text/plain", on_click="ignore")
+            col_jsonl.download_button("Spans (JSONL)", TELEMETRY.to_jsonl, file_name="joblens_spans.jsonl", mime="application/jsonl", on_click="ignore")
 
 # --- MAJOR REFACTOR: This is the new application flow logic ---
 
 # STATE 1: Initial job scraping
-if 'scraped_df' not in st.session_state and 'analysis_running' not in st.session_state:
+if 'scraped_job_ids' not in st.session_state and 'analysis_running' not in st.session_state:
     st.header("Step 1: Find Job Opportunities")
     st.write("Perform a quick, free search to find jobs. You can select which ones to analyze in the next step.")
     with st.form("scrape_form"):
@@ -284,19 +328,30 @@ if 'scraped_df' not in st.session_state and 'analysis_running' not in st.session
         submitted = st.form_submit_button("Find Jobs", type="primary")
 
     if submitted:
-        df = run_linkedin_scraper(title_input, location_input, pages_to_scrape)
-        if df is not None and not df.empty:
-            df.insert(0, "Select", False); st.session_state.scraped_df = df; st.rerun()
+        job_ids = run_linkedin_scraper(title_input, location_input, pages_to_scrape)
+        if job_ids:
+            st.session_state.scraped_job_ids = job_ids; st.rerun()
         else:
             st.error("Scraping did not return any data. Please try different keywords.")
 
 # STATE 2: Job selection for analysis
-elif 'scraped_df' in st.session_state:
+elif 'scraped_job_ids' in st.session_state:
     st.header("Step 2: Select Jobs for Deep Analysis")
-    st.write("Check the box for up to 3 jobs you want to analyze. This will use your credits.")
+    st.write("Check the box for up to 3 jobs you want to analyze. This will use your credits. Jobs are sorted by a free local relevance score against your resume.")
     
-    df = st.session_state['scraped_df']
-    edited_df = st.data_editor(df, hide_index=True, column_config={"Select": st.column_config.CheckboxColumn(required=True), "job_id": None}, disabled=df.columns.drop("Select"))
+    job_store = get_job_store()
+    df = job_store.frame(st.session_state['scraped_job_ids'])
+    # NEW: Free local pre-ranking of every scraped job against the resume, computed once per search
+    if 'job_relevance' not in st.session_state and st.session_state.get('resume_text'):
+        from ranking import rank_jobs
+        job_texts = (df['job_title'].astype(object).fillna("") + "\n" + df['job_desc']).tolist()
+        scores = rank_jobs(job_texts, st.session_state['resume_text'], resume_profile=st.session_state.get('resume_profile'))
+        st.session_state.job_relevance = dict(zip(df['job_id'], scores.tolist()))
+        df = df.iloc[(-scores).argsort(kind="stable")].reset_index(drop=True)
+        st.session_state.scraped_job_ids = df['job_id'].tolist()
+    if 'job_relevance' in st.session_state: df.insert(0, "Relevance", df['job_id'].map(st.session_state.job_relevance))
+    df.insert(0, "Select", False)
+    edited_df = st.data_editor(df, hide_index=True, column_config={"Select": st.column_config.CheckboxColumn(required=True), "Relevance": st.column_config.ProgressColumn("Relevance", help="Local resume-vs-job keyword score. Free, no credits used.", min_value=0, max_value=100, format="%.0f"), "job_id": None}, disabled=df.columns.drop("Select"))
     
     selected_jobs = edited_df[edited_df.Select]
     num_selected = len(selected_jobs)
@@ -311,75 +366,74 @@ elif 'scraped_df' in st.session_state:
     with col2:
         analyze_button_disabled = (num_selected == 0 or num_selected > 3 or not st.session_state.get('resume_text') or num_selected > credits_left)
         if st.button(f"Analyze {num_selected} Selected Jobs", type="primary", disabled=analyze_button_disabled):
-            # NEW: Set up the session state for the live analysis page and rerun
-            st.session_state.analysis_running = True
-            st.session_state.jobs_to_analyze = selected_jobs.to_dict(orient='records')
-            st.session_state.successful_analyses = []
-            st.session_state.failed_analyses = []
-            del st.session_state['scraped_df'] # Transition away from this page
-            st.rerun()
-
-# STATE 3: DYNAMIC ANALYSIS - This is the new "live" results page
+            # NEW: Hand the batch to the background worker, then rerun into the live analysis page
+            jobs = job_store.records(selected_jobs['job_id'].tolist(), fields=["job_id", "job_title", "company_name", "job_desc"])
+            batch_id = submit_analysis_batch(user_ip, jobs, st.session_state['resume_text'])
+            if batch_id is None:
+                st.error("You no longer have enough credits for this selection.")
+            else:
+                st.session_state.analysis_batch_id = batch_id
+                st.query_params["batch"] = batch_id
+                st.session_state.analysis_running = True
+                st.session_state.successful_analyses = []
+                st.session_state.failed_analyses = []
+                # Transition away from this page
+                del st.session_state['scraped_job_ids']
+                st.session_state.pop('job_relevance', None)
+                st.rerun()
+
+# STATE 3: DYNAMIC ANALYSIS - Live results page, polling the background analysis worker
 elif st.session_state.get('analysis_running'):
-    st.header("🔬 Analyzing Jobs...")
-    st.write("Results will appear below as they are completed.")
-    
-    jobs_to_process = st.session_state.jobs_to_analyze
-    num_jobs = len(jobs_to_process)
-    
-    # Create a placeholder for each job
-    placeholders = {job['job_id']: st.empty() for job in jobs_to_process}
-    for job_id, placeholder in placeholders.items():
-        job_title = next((job['job_title'] for job in jobs_to_process if job['job_id'] == job_id), "Unknown Job")
-        with placeholder.container():
-            st.status(f"Pending analysis for: **{job_title}**", expanded=True)
-
-    client = groq.Groq(api_key=api_key)
-    successful_count = 0
-
-    with ThreadPoolExecutor(max_workers=min(num_jobs, 8)) as executor:
-        future_to_job = {executor.submit(run_deep_analysis, client, job['job_desc'], st.session_state['resume_text']): job for job in jobs_to_process}
-        
-        for future in as_completed(future_to_job):
-            job_row = future_to_job[future]
-            job_id = job_row['job_id']
-            placeholder = placeholders[job_id]
-            
-            try:
-                analysis_result = future.result()
-                job_row['analysis'] = analysis_result
-                
-                # Update the specific job's placeholder with the result
-                with placeholder.container():
-                    display_result_in_container(st, job_row)
-
-                if analysis_result.get('status') == 'success':
-                    st.session_state.successful_analyses.append(job_row)
-                    successful_count += 1
+    batch_id = st.session_state.get('analysis_batch_id')
+    batch = get_analysis_worker().get_batch(batch_id) if batch_id else None
+
+    if batch is None:
+        st.error("This analysis is no longer available (the server may have restarted). Please start a new search.")
+        st.session_state.analysis_running = False
+        st.button("Start New Search", on_click=reset_flow)
+
+    elif not batch['done']:
+        st.header("🔬 Analyzing Jobs...")
+        st.write("Results will appear below as they are completed. You can safely refresh this page.")
+
+        # Only this fragment re-runs while polling; a full rerun finalizes the page once the batch is done
+        @st.fragment(run_every=0.5)
+        def show_analysis_progress():
+            batch = get_analysis_worker().get_batch(batch_id)
+            if batch is None or batch['done']: st.rerun()
+            for task in batch['tasks']:
+                if task['status'] == 'done':
+                    display_result_in_container(st, {**task['job'], 'analysis': task['result']})
+                elif task['partial']:
+                    display_partial_result(st, task['job'], task['partial'])
                 else:
-                    st.session_state.failed_analyses.append(job_row)
-            except Exception as exc:
-                job_row['analysis'] = {"status": "error", "match_analysis": f"Critical error: {exc}"}
-                with placeholder.container():
-                    display_result_in_container(st, job_row)
-                st.session_state.failed_analyses.append(job_row)
-
-    # All jobs are finished, finalize the process
-    st.header("✅ Analysis Complete")
-    st.info(f"{successful_count} of {num_jobs} jobs analyzed successfully.")
-    if successful_count > 0:
-        update_user_credits(user_ip, successful_count)
-        st.success(f"Your credits have been updated.")
-    
-    # Clean up the 'running' state
-    st.session_state.analysis_running = False
-    st.button("Start New Search", on_click=reset_flow)
+                    label = "Analyzing" if task['status'] == 'running' else "Pending analysis for"
+                    st.status(f"{label}: **{task['job']['job_title']}**", state="running", expanded=True)
+        show_analysis_progress()
+
+    else:
+        finished = [{**task['job'], 'analysis': task['result']} for task in batch['tasks']]
+        st.session_state.successful_analyses = [{'job_id': row['job_id'], 'analysis': row['analysis']} for row in finished if row['analysis'].get('status') == 'success']
+        st.session_state.failed_analyses = [{'job_id': row['job_id'], 'analysis': row['analysis']} for row in finished if row['analysis'].get('status') != 'success']
+        successful_count = len(st.session_state.successful_analyses)
+        for row in finished:
+            display_result_in_container(st, row)
+
+        # All jobs are finished; credits were charged by the worker when the batch completed
+        st.header("✅ Analysis Complete")
+        st.info(f"{successful_count} of {len(finished)} jobs analyzed successfully.")
+        if successful_count > 0:
+            st.success(f"Your credits have been updated.")
+
+        # Clean up the 'running' state
+        st.session_state.analysis_running = False
+        st.button("Start New Search", on_click=reset_flow)
 
 # STATE 4: Static results page (if user reloads or comes back)
 else:
     st.header("✅ Analysis Results")
-    successful_results = st.session_state.get('successful_analyses', [])
-    failed_results = st.session_state.get('failed_analyses', [])
+    successful_results = with_job_details(st.session_state.get('successful_analyses', []))
+    failed_results = with_job_details(st.session_state.get('failed_analyses', []))
     
     if successful_results:
         st.info(f"{len(successful_results)} jobs were analyzed successfully.")
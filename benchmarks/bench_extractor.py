@@ -0,0 +1,105 @@
+# benchmarks/bench_extractor.py
+# Parse time and peak memory per document for job_extractor versus the previous
+# in-app parsing code (full html.parser tree, two `find` calls per field), over the
+# saved fixtures in benchmarks/fixtures. Also checks both produce identical output.
+#
+#   python benchmarks/bench_extractor.py --repeat 50
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from job_extractor import PARSER, extract_job_ids, extract_job_post, parse_num_applicants, parse_time_posted
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def legacy_job_post(job_id, posting_html):
+    job_soup = BeautifulSoup(posting_html, "html.parser")
+    salary_raw = None
+    try:
+        insights = job_soup.find_all("li", {"class": "job-details-jobs-unified-top-card__job-insight"})
+        for insight in insights:
+            if "💰" in insight.get_text():
+                salary_raw = insight.find("span").text.strip()
+                break
+    except: pass
+    return {
+        'job_id': job_id, 'job_link': f"https://www.linkedin.com/jobs/view/{job_id}",
+        'job_title': job_soup.find("h2", {"class":"top-card-layout__title"}).text.strip() if job_soup.find("h2", {"class":"top-card-layout__title"}) else "N/A",
+        'company_name': job_soup.find("a", {"class": "topcard__org-name-link"}).text.strip() if job_soup.find("a", {"class": "topcard__org-name-link"}) else "N/A",
+        'salary': salary_raw,
+        'job_desc': job_soup.find("div", {"class": "show-more-less-html__markup"}).get_text(separator="\n").strip() if job_soup.find("div", {"class": "show-more-less-html__markup"}) else "",
+        'hours_posted': parse_time_posted(job_soup.find("span", {"class": "posted-time-ago__text"}).text.strip() if job_soup.find("span", {"class": "posted-time-ago__text"}) else None),
+        'applicants_count': parse_num_applicants(job_soup.find("span", {"class": "num-applicants__caption"}).text.strip() if job_soup.find("span", {"class": "num-applicants__caption"}) else None)
+    }
+
+
+def legacy_job_ids(list_html):
+    job_ids = []
+    for job in BeautifulSoup(list_html, "html.parser").find_all("li"):
+        job_id = job.find("div", {"class": "base-card"}).get("data-entity-urn", "").split(":")[-1]
+        if job_id and job_id not in job_ids: job_ids.append(job_id)
+    return job_ids
+
+
+def measure(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat): result = fn()
+    elapsed = (time.perf_counter() - started) / repeat
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def report(name, size, legacy, current):
+    (_, old_t, old_mem), (_, new_t, new_mem) = legacy, current
+    print(f"{name:24s} {size / 1024:7.1f} KB | legacy {old_t * 1000:7.2f} ms {old_mem / 1024:8.0f} KB"
+          f" | extractor {new_t * 1000:7.2f} ms {new_mem / 1024:8.0f} KB | {old_t / new_t:4.1f}x faster")
+    return {"document": name, "bytes": size, "legacy_ms": old_t * 1000, "legacy_peak_kb": old_mem / 1024,
+            "extractor_ms": new_t * 1000, "extractor_peak_kb": new_mem / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job_extractor against the legacy parsing code.")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+    print(f"extractor parser backend: {PARSER}")
+    rows, mismatches = [], []
+
+    with open(os.path.join(FIXTURES, "postings", "job_ids.json")) as f: job_ids = json.load(f)
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "postings", "*.html"))):
+        name = os.path.basename(path)
+        with open(path, encoding="utf-8") as f: html = f.read()
+        legacy = measure(lambda: legacy_job_post(job_ids[name], html), args.repeat)
+        current = measure(lambda: extract_job_post(job_ids[name], html), args.repeat)
+        if legacy[0] != current[0]: mismatches.append(name)
+        rows.append(report(name, len(html.encode("utf-8")), legacy, current))
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "lists", "*.html"))):
+        name = os.path.basename(path)
+        with open(path, encoding="utf-8") as f: html = f.read()
+        legacy = measure(lambda: legacy_job_ids(html), args.repeat)
+        current = measure(lambda: extract_job_ids(html), args.repeat)
+        if legacy[0] != current[0]: mismatches.append(name)
+        rows.append(report(name, len(html.encode("utf-8")), legacy, current))
+
+    print("output parity: " + ("OK" if not mismatches else f"MISMATCH in {', '.join(mismatches)}"))
+    if args.output:
+        with open(args.output, "w") as f: json.dump({"parser": PARSER, "repeat": args.repeat, "results": rows, "mismatches": mismatches}, f, indent=2)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_http_engine.py
+# Compares the old fetch path (bare requests.get on 8 threads, no retries) with
+# HttpEngine, built with the app's settings, against the local LinkedIn stand-in,
+# with injected latency, random 429/503 responses and a concurrency cap above which
+# the server throttles. --rps overrides the engine's rate limit like JOBLENS_LINKEDIN_RPS.
+#
+#   python benchmarks/bench_http_engine.py --jobs 300 --latency 0.2 --throttle-rate 0.02 --max-concurrent 12
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from fake_linkedin import FakeLinkedInServer
+from http_engine import DEFAULT_REQUESTS_PER_SECOND, FetchError, HttpEngine
+
+
+def detail_urls(base_url, count):
+    return [f"{base_url}/jobs-guest/jobs/api/jobPosting/{4000000000 + i}" for i in range(count)]
+
+
+def run_baseline(urls):
+    def fetch(url):
+        try:
+            response = requests.get(url, timeout=15)
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException:
+            return None
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(fetch, urls))
+    return time.perf_counter() - started, sum(r is not None for r in results)
+
+
+def run_engine(urls, engine):
+    started = time.perf_counter()
+    futures = [engine.submit(url) for url in urls]
+    ok = 0
+    for future in futures:
+        try: future.result(); ok += 1
+        except FetchError: pass
+    return time.perf_counter() - started, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HttpEngine against the fake LinkedIn server.")
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--throttle-rate", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--max-concurrent", type=int, default=12)
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND, help="HttpEngine per-host rate limit (defaults to the app's)")
+    args = parser.parse_args()
+
+    with FakeLinkedInServer(latency=args.latency, throttle_rate=args.throttle_rate, error_rate=args.error_rate, max_concurrent=args.max_concurrent) as server:
+        urls = detail_urls(server.base_url, args.jobs)
+        elapsed, ok = run_baseline(urls)
+        print(f"baseline  requests.get x8 threads : {elapsed:6.2f}s  {ok}/{len(urls)} ok  {len(urls) / elapsed:6.1f} req/s")
+
+        engine = HttpEngine(requests_per_second=args.rps)
+        try:
+            elapsed, ok = run_engine(urls, engine)
+            stats = engine.stats()
+        finally:
+            engine.close()
+        limits = {host: info["limit"] for host, info in stats["hosts"].items()}
+        print(f"HttpEngine (pooled, AIMD)         : {elapsed:6.2f}s  {ok}/{len(urls)} ok  {len(urls) / elapsed:6.1f} req/s")
+        print(f"  retries={stats['retries']} throttled={stats['throttled']} server_errors={stats['server_errors']} final concurrency={limits}")
+        print(f"  server hits: {server.hits}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_job_store.py
+# Memory held by 50 concurrent sessions that searched a handful of popular titles
+# (10 pages = 250 postings each, overlapping between titles) and analysed 3 jobs.
+# "per-session" rebuilds the old state: a full DataFrame per session plus job
+# dicts copied into the analysis results. "job store" keeps one shared JobStore
+# and only job IDs, relevance scores and results in each session. Postings are
+# JSON round-tripped per session, as reads from the shared DiskCache are.
+# Also times JobStore.frame, which now runs on every rerun of the selection page.
+#
+#   python benchmarks/bench_job_store.py --sessions 50 --searches 5
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_ranking import synthetic_jobs
+from job_store import JobStore
+
+JOBS_PER_SEARCH = 250
+ANALYSED_PER_SESSION = 3
+
+
+def make_searches(searches, overlap, seed=0):
+    # Each popular search returns 250 postings; `overlap` of them also appear in the other searches
+    rng = random.Random(seed)
+    shared_count = int(JOBS_PER_SEARCH * overlap)
+    descriptions = synthetic_jobs(shared_count + searches * (JOBS_PER_SEARCH - shared_count), words=400, seed=seed)
+    posts = [{'job_id': str(4000000000 + i), 'job_link': f"https://www.linkedin.com/jobs/view/{4000000000 + i}",
+              'job_title': rng.choice(["Data Scientist", "Senior Data Scientist", "ML Engineer", "Data Analyst", "Analytics Engineer"]),
+              'company_name': f"Company {rng.randint(1, 400)}", 'salary': rng.choice([None, "$120K/yr - $150K/yr", "$90K/yr - $110K/yr"]),
+              'job_desc': desc, 'hours_posted': rng.choice([None, 0, 24, 72, 168]), 'applicants_count': rng.choice([None, rng.randint(1, 200)])}
+             for i, desc in enumerate(descriptions)]
+    shared, rest = posts[:shared_count], posts[shared_count:]
+    return [shared + rest[i * (JOBS_PER_SEARCH - shared_count):(i + 1) * (JOBS_PER_SEARCH - shared_count)] for i in range(searches)]
+
+
+def analysis_result(job_id):
+    return {'status': 'success', 'resume_match_score': 80, 'match_analysis': "Good overlap. " * 40,
+            'updated_resume_latex': f"% {job_id}\n" + "\\item Built models in Python \\& SQL\n" * 120, 'cover_letter_latex': "Dear Hiring Manager,\n" * 150}
+
+
+def per_session_state(search_posts, rng):
+    import pandas as pd
+    df = pd.DataFrame(json.loads(json.dumps(search_posts)))
+    df.insert(0, "Select", False)
+    df.insert(1, "Relevance", [round(rng.random() * 100, 1) for _ in range(len(df))])
+    selected = df.sample(ANALYSED_PER_SESSION, random_state=rng.randint(0, 10 ** 6)).to_dict(orient='records')
+    return {'scraped_df': df, 'successful_analyses': [{**job, 'analysis': analysis_result(job['job_id'])} for job in selected]}
+
+
+def job_store_state(store, search_posts, rng):
+    job_ids = store.add(json.loads(json.dumps(search_posts)))
+    relevance = {job_id: round(rng.random() * 100, 1) for job_id in job_ids}
+    return {'scraped_job_ids': job_ids, 'job_relevance': relevance,
+            'successful_analyses': [{'job_id': job_id, 'analysis': analysis_result(job_id)} for job_id in rng.sample(job_ids, ANALYSED_PER_SESSION)]}
+
+
+def arrow_bytes():
+    # pandas keeps string columns in Arrow buffers when pyarrow is installed; tracemalloc doesn't see those
+    try:
+        import pyarrow
+    except ImportError:
+        return 0
+    return pyarrow.total_allocated_bytes()
+
+
+def traced_mb(build):
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0] + arrow_bytes()
+    state = build()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] + arrow_bytes() - baseline
+    tracemalloc.stop()
+    return state, round(held / 2 ** 20, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory held by concurrent search sessions.")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--searches", type=int, default=5, help="Distinct popular searches the sessions spread over")
+    parser.add_argument("--overlap", type=float, default=0.3, help="Share of each search's postings that the other searches also return")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    import pandas  # noqa: F401  Imported before tracing so module objects are not counted
+    searches = make_searches(args.searches, args.overlap)
+    results = {"sessions": args.sessions, "searches": args.searches, "jobs_per_session": JOBS_PER_SEARCH}
+
+    rng = random.Random(1)
+    _, results["per_session_mb"] = traced_mb(lambda: [per_session_state(searches[i % args.searches], rng) for i in range(args.sessions)])
+    rng, store = random.Random(1), JobStore()
+    sessions, results["job_store_mb"] = traced_mb(lambda: [job_store_state(store, searches[i % args.searches], rng) for i in range(args.sessions)])
+    results["store"] = store.stats()
+
+    store.frame(sessions[0]['scraped_job_ids'])
+    started = time.perf_counter()
+    for session in sessions: store.frame(session['scraped_job_ids'])
+    results["frame_ms"] = round((time.perf_counter() - started) / len(sessions) * 1000, 2)
+
+    print(f"{args.sessions} sessions over {args.searches} searches ({JOBS_PER_SEARCH} jobs each, {ANALYSED_PER_SESSION} analysed per session)")
+    print(f"  per-session DataFrames: {results['per_session_mb']:8.1f} MB")
+    print(f"  shared job store:       {results['job_store_mb']:8.1f} MB  ({results['store']['jobs']} jobs, {results['store']['descriptions']} descriptions)")
+    print(f"  JobStore.frame for one session's table: {results['frame_ms']:.2f} ms")
+    if args.output:
+        with open(args.output, "w") as f: json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# benchmarks/bench_pipeline.py
+# End-to-end scrape -> analyse benchmark against the local LinkedIn and Groq
+# stand-ins. Scrapes 1-10 list pages through linkedin_scraper.stream_linkedin_jobs
+# (the loop behind app.run_linkedin_scraper, minus the Streamlit widgets), then runs
+# deep_analysis.run_deep_analysis on the scraped postings at fan-outs 1-8 with the
+# real groq client (streamed unless --no-stream). Reports jobs/s, p50/p95/p99 per
+# stage (including time_to_summary: until the score and match analysis are in),
+# and peak traced memory, and writes everything to a JSON file that --compare can
+# diff against a later run.
+#
+#   python benchmarks/bench_pipeline.py --output before.json
+#   python benchmarks/bench_pipeline.py --output after.json --compare before.json
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import groq
+import numpy as np
+
+import linkedin_scraper
+from bench_ranking import RESUME
+from deep_analysis import REQUIRED_FIELDS, run_deep_analysis
+from disk_cache import DiskCache
+from fake_groq import FakeGroqServer
+from fake_linkedin import PAGE_SIZE, FakeLinkedInServer, load_recorded_postings
+from http_engine import DEFAULT_MAX_CONCURRENCY, DEFAULT_REQUESTS_PER_SECOND, HttpEngine
+from linkedin_scraper import stream_linkedin_jobs
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock: self.samples.setdefault(stage, []).append(seconds)
+
+    def timed(self, stage, fn):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try: return fn(*args, **kwargs)
+            finally: self.record(stage, time.perf_counter() - started)
+        return wrapper
+
+    def summary(self):
+        result = {}
+        for stage, values in sorted(self.samples.items()):
+            p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+            result[stage] = {"count": len(values), "p50_ms": round(p50, 2), "p95_ms": round(p95, 2), "p99_ms": round(p99, 2)}
+        return result
+
+
+class TimedEngine:
+    # Wraps HttpEngine so list-page and posting requests are timed separately, retries included
+    def __init__(self, engine, timer):
+        self._engine = engine
+        self._timer = timer
+
+    def get_text(self, url, timeout=None):
+        stage = "list_http" if "seeMoreJobPostings" in url else "detail_http"
+        return self._timer.timed(stage, self._engine.get_text)(url, timeout=timeout)
+
+    def __getattr__(self, name):
+        return getattr(self._engine, name)
+
+
+def measure(run, trace_memory):
+    # Timings come from an untraced run; tracemalloc slows allocation-heavy code, so peak memory gets its own pass
+    result = run()
+    if trace_memory:
+        tracemalloc.start()
+        run()
+        result["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        tracemalloc.stop()
+    return result
+
+
+def run_scrape(base_url, pages, args, cache_dir):
+    timer = StageTimer()
+    engine = TimedEngine(HttpEngine(requests_per_second=args.rps, max_concurrency=args.max_concurrency), timer)
+    cache = DiskCache(os.path.join(cache_dir, f"scrape-{time.monotonic_ns()}.sqlite3"), "job_posts", ttl_seconds=3600, max_entries=100000)
+    original_fetch = linkedin_scraper.fetch_job_details
+    linkedin_scraper.fetch_job_details = timer.timed("fetch_job_details", original_fetch)
+    jobs, failed = [], 0
+    try:
+        started = time.perf_counter()
+        for event in stream_linkedin_jobs("Data Scientist", "USA", pages, engine, cache, base_url):
+            if event[0] == 'job' and event[1]: jobs.append(event[1])
+            elif event[0] == 'job': failed += 1
+        elapsed = time.perf_counter() - started
+        stats = engine.stats()
+    finally:
+        linkedin_scraper.fetch_job_details = original_fetch
+        engine.close()
+    timer.record("scrape", elapsed)
+    return {"pages": pages, "jobs": len(jobs), "failed": failed, "seconds": round(elapsed, 3), "jobs_per_sec": round(len(jobs) / elapsed, 2),
+            "stages": timer.summary(), "http": {key: stats[key] for key in ("requests", "retries", "throttled", "server_errors", "failures")}, "posts": jobs}
+
+
+def run_analysis(client, posts, fanout, stream):
+    timer = StageTimer()
+
+    def analyze(post):
+        started, summary_seen = time.perf_counter(), []
+        def on_update(fields):
+            if not summary_seen and all(field in fields for field in REQUIRED_FIELDS):
+                summary_seen.append(True)
+                timer.record("time_to_summary", time.perf_counter() - started)
+        result = run_deep_analysis(client, post['job_desc'], RESUME, on_update, stream)
+        timer.record("run_deep_analysis", time.perf_counter() - started)
+        return result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=fanout) as executor:
+        results = list(executor.map(analyze, posts))
+    elapsed = time.perf_counter() - started
+    timer.record("analysis_batch", elapsed)
+    ok = sum(result.get('status') == 'success' for result in results)
+    truncated = sum(bool(result.get('truncated')) for result in results)
+    return {"fanout": fanout, "jobs": len(posts), "ok": ok, "truncated": truncated, "seconds": round(elapsed, 3), "jobs_per_sec": round(len(posts) / elapsed, 2), "stages": timer.summary()}
+
+
+def git_commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): return None
+
+
+def compare(previous, current):
+    # Prints throughput and p95 changes for every scenario present in both runs
+    for section, key, stage in (("scrape", "pages", "fetch_job_details"), ("analysis", "fanout", "run_deep_analysis")):
+        before = {row[key]: row for row in previous.get(section, [])}
+        for row in current[section]:
+            old = before.get(row[key])
+            if old is None: continue
+            throughput = (row["jobs_per_sec"] / old["jobs_per_sec"] - 1) * 100 if old["jobs_per_sec"] else float("nan")
+            old_p95, new_p95 = old["stages"].get(stage, {}).get("p95_ms"), row["stages"].get(stage, {}).get("p95_ms")
+            p95 = f"{(new_p95 / old_p95 - 1) * 100:+6.1f}%" if old_p95 and new_p95 else "   n/a"
+            print(f"{section:8s} {key}={row[key]:<2d}  jobs/s {throughput:+6.1f}%   {stage} p95 {p95}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrape and analysis pipeline against local LinkedIn and Groq stand-ins.")
+    parser.add_argument("--pages", type=int, nargs="+", default=list(range(1, 11)))
+    parser.add_argument("--fanouts", type=int, nargs="+", default=list(range(1, 9)))
+    parser.add_argument("--analysis-jobs", type=int, default=8, help="Postings analysed at each fan-out")
+    parser.add_argument("--latency", type=float, default=0.05, help="LinkedIn stand-in mean latency (s)")
+    parser.add_argument("--throttle-rate", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--max-concurrent", type=int, default=24)
+    parser.add_argument("--generated", action="store_true", help="Serve generated postings instead of the recorded fixtures")
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND, help="HttpEngine per-host rate limit (defaults to the app's)")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--groq-latency", type=float, default=0.5)
+    parser.add_argument("--groq-throttle-rate", type=float, default=0.02)
+    parser.add_argument("--groq-error-rate", type=float, default=0.02)
+    parser.add_argument("--groq-malformed-rate", type=float, default=0.0, help="Share of Groq replies cut off half-way")
+    parser.add_argument("--no-stream", action="store_true", help="Request whole Groq completions instead of streaming them")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier --output file to compare against")
+    args = parser.parse_args()
+
+    results = {"meta": {"commit": git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                        "platform": platform.platform(), "args": vars(args)}, "scrape": [], "analysis": []}
+    postings = None if args.generated else load_recorded_postings()
+    linkedin = FakeLinkedInServer(latency=args.latency, throttle_rate=args.throttle_rate, error_rate=args.error_rate, max_concurrent=args.max_concurrent,
+                                  total_jobs=PAGE_SIZE * max(args.pages), postings=postings)
+    fake_groq = FakeGroqServer(latency=args.groq_latency, throttle_rate=args.groq_throttle_rate, error_rate=args.groq_error_rate, malformed_rate=args.groq_malformed_rate)
+    posts = []
+    with linkedin, fake_groq, tempfile.TemporaryDirectory() as cache_dir:
+        for pages in args.pages:
+            row = measure(lambda: run_scrape(linkedin.base_url, pages, args, cache_dir), not args.no_memory)
+            posts = row.pop("posts") or posts
+            stage = row["stages"].get("fetch_job_details", {"p50_ms": 0, "p95_ms": 0, "p99_ms": 0})
+            print(f"scrape   pages={pages:<2d} {row['jobs']:4d} jobs in {row['seconds']:6.2f}s  {row['jobs_per_sec']:7.1f} jobs/s  "
+                  f"fetch_job_details p50/p95/p99 {stage['p50_ms']:.0f}/{stage['p95_ms']:.0f}/{stage['p99_ms']:.0f} ms  peak {row.get('peak_memory_mb', float('nan')):.1f} MB")
+            results["scrape"].append(row)
+
+        client = groq.Groq(api_key="fake", base_url=fake_groq.base_url)
+        sample = (posts * args.analysis_jobs)[:args.analysis_jobs]
+        for fanout in args.fanouts:
+            row = measure(lambda: run_analysis(client, sample, fanout, not args.no_stream), not args.no_memory)
+            stage = row["stages"]["run_deep_analysis"]
+            summary = row["stages"].get("time_to_summary", {"p50_ms": float('nan')})
+            print(f"analysis fanout={fanout:<2d} {row['ok']}/{row['jobs']} ok in {row['seconds']:6.2f}s  {row['jobs_per_sec']:7.2f} jobs/s  "
+                  f"run_deep_analysis p50/p95/p99 {stage['p50_ms']:.0f}/{stage['p95_ms']:.0f}/{stage['p99_ms']:.0f} ms  "
+                  f"time_to_summary p50 {summary['p50_ms']:.0f} ms  peak {row.get('peak_memory_mb', float('nan')):.1f} MB")
+            results["analysis"].append(row)
+        results["meta"]["server_hits"] = {"linkedin": linkedin.hits, "groq": fake_groq.hits}
+
+    if args.compare:
+        with open(args.compare) as f: compare(json.load(f), results)
+    if args.output:
+        with open(args.output, "w") as f: json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
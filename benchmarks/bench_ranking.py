@@ -0,0 +1,60 @@
+# benchmarks/bench_ranking.py
+# Time for ranking.rank_jobs to score synthetic corpora of 100 to 10k job
+# descriptions (~300 words each) against one resume.
+#
+#   python benchmarks/bench_ranking.py --sizes 100 500 1000 10000
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ranking import SKILL_KEYWORDS, rank_jobs
+
+FILLER = ("collaborate stakeholders deliver insights customers product roadmap scalable reliable data platform "
+          "analytics pipelines models dashboards reporting business impact ownership communication mentoring "
+          "cloud infrastructure architecture quality testing documentation growth marketing finance healthcare").split()
+SKILLS = sorted(SKILL_KEYWORDS)
+
+RESUME = ("Data scientist with six years of experience building machine learning models in Python, SQL and PyTorch. "
+          "Deployed forecasting and NLP services on AWS with Docker and Airflow; built Tableau dashboards for "
+          "stakeholders and mentored analysts. Skills: pandas, numpy, scikit-learn, xgboost, spark, statistics.")
+
+
+def synthetic_jobs(count, words=300, seed=0):
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        focus = rng.sample(SKILLS, 8)
+        jobs.append(" ".join(rng.choice(focus) if rng.random() < 0.12 else rng.choice(FILLER) for _ in range(words)))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local job ranking on synthetic corpora.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+    results = []
+    for size in args.sizes:
+        jobs = synthetic_jobs(size)
+        rank_jobs(jobs, RESUME)  # warm-up
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            scores = rank_jobs(jobs, RESUME)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        print(f"{size:6d} jobs: {best * 1000:8.1f} ms  ({size / best:9.0f} jobs/s)  top score {scores.max():5.1f}")
+        results.append({"jobs": size, "best_ms": best * 1000, "median_ms": sorted(timings)[len(timings) // 2] * 1000})
+    if args.output:
+        with open(args.output, "w") as f: json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
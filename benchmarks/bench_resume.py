@@ -0,0 +1,110 @@
+# benchmarks/bench_resume.py
+# Resume ingestion on generated multi-page PDFs (1 to 100 pages): the old
+# page-by-page `text +=` read, resume_ingest.ResumeIngestor extracting in-process
+# and on its process pool (pool already started; its start-up cost is reported
+# separately), and a repeat upload served from the hash-keyed cache. Also times
+# rank_jobs with the precomputed token profile against re-tokenizing the resume.
+#
+#   python benchmarks/bench_resume.py --pages 1 5 20 50 100 --workers 4
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_ranking import RESUME, synthetic_jobs
+from resume_ingest import ResumeIngestor
+
+LINES_PER_PAGE = 48
+
+
+def make_pdf(n_pages, seed=0):
+    # A minimal PDF with one Helvetica text stream per page, like an exported resume
+    rng = random.Random(seed)
+    words = RESUME.replace(",", "").replace(".", "").split()
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for _ in range(n_pages):
+        lines = [" ".join(rng.choice(words) for _ in range(12)) for _ in range(LINES_PER_PAGE)]
+        text = "BT /F1 10 Tf 14 TL 50 780 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        stream = zlib.compress(text.encode("latin-1"))
+        objects.append(f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode("latin-1") + stream + b"\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {n_pages} >>"
+    out, offsets = io.BytesIO(), []
+    out.write(b"%PDF-1.4\n")
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode("latin-1") + (body if isinstance(body, bytes) else body.encode("latin-1")) + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets: out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+def read_pdf_baseline(data):
+    # app.read_pdf before resume_ingest
+    import PyPDF2
+    text = ""
+    for page in PyPDF2.PdfReader(io.BytesIO(data)).pages: text += page.extract_text() or ""
+    return text
+
+
+def best_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(min(timings) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume PDF ingestion.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50, 100])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    serial = ResumeIngestor(max_entries=0, parallel_min_pages=10 ** 9)
+    parallel = ResumeIngestor(max_entries=0, parallel_min_pages=1, max_workers=args.workers)
+    started = time.perf_counter()
+    parallel.ingest(make_pdf(args.workers, seed=-1), is_pdf=True)  # Starts the pool and imports PyPDF2 in every worker
+    results = {"pool_startup_ms": round((time.perf_counter() - started) * 1000, 1), "pdfs": []}
+    print(f"process pool start-up ({args.workers} workers): {results['pool_startup_ms']:.0f} ms")
+
+    for n_pages in args.pages:
+        data = make_pdf(n_pages)
+        cached = ResumeIngestor()
+        cached.ingest(data, is_pdf=True)
+        row = {"pages": n_pages, "kb": round(len(data) / 1024, 1),
+               "baseline_ms": best_ms(lambda: read_pdf_baseline(data), args.repeat),
+               "serial_ms": best_ms(lambda: serial.ingest(data, is_pdf=True), args.repeat),
+               "parallel_ms": best_ms(lambda: parallel.ingest(data, is_pdf=True), args.repeat),
+               "cache_hit_ms": best_ms(lambda: cached.ingest(data, is_pdf=True), args.repeat)}
+        results["pdfs"].append(row)
+        print(f"{n_pages:4d} pages ({row['kb']:7.1f} KB)  baseline {row['baseline_ms']:8.1f} ms  serial {row['serial_ms']:8.1f} ms  "
+              f"pool {row['parallel_ms']:8.1f} ms  cache hit {row['cache_hit_ms']:6.2f} ms")
+    parallel.shutdown()
+
+    from ranking import rank_jobs
+    jobs, resume = synthetic_jobs(200), cached.ingest(make_pdf(2), is_pdf=True)
+    results["rank_200_jobs_ms"] = {"resume_text": best_ms(lambda: rank_jobs(jobs, resume.text), args.repeat),
+                                   "resume_profile": best_ms(lambda: rank_jobs(jobs, resume.text, resume_profile=resume.profile), args.repeat)}
+    print(f"rank_jobs on 200 jobs: {results['rank_200_jobs_ms']['resume_text']:.1f} ms re-tokenizing the resume, "
+          f"{results['rank_200_jobs_ms']['resume_profile']:.1f} ms with its profile")
+    if args.output:
+        with open(args.output, "w") as f: json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
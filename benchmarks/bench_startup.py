@@ -0,0 +1,143 @@
+# benchmarks/bench_startup.py
+# Cold-start cost of the Streamlit app: import time of the heavy dependencies and
+# of app.py's module-level imports, each in a fresh interpreter, and the wall time
+# of the first render and of a warm rerun (streamlit.testing AppTest). Renders are
+# timed twice: with credits kept in memory, and with the production Firestore credit
+# store, where firebase_admin is really imported but firestore.client() returns an
+# in-memory stub, so no Firebase project or network is involved (Firestore round
+# trips are not included). Also lists which heavy libraries each first page pulled
+# in. --max-* options turn it into a regression check against the Firestore path.
+#
+#   python benchmarks/bench_startup.py --max-header-ms 300 --max-first-render-ms 2500
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+HEAVY_MODULES = ["pandas", "numpy", "PyPDF2", "groq", "firebase_admin.firestore", "bs4", "lxml.etree", "httpx"]
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+{statements}
+print(time.perf_counter() - started)
+"""
+
+RENDER_SNIPPET = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+{prelude}
+heavy = {heavy!r}
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.secrets["GROQ_API_KEY"] = "benchmark"
+at.secrets["firebase_service_account"] = {{"private_key": "benchmark"}}
+started = time.perf_counter(); at.run(); first = time.perf_counter() - started
+started = time.perf_counter(); at.run(); rerun = time.perf_counter() - started
+print(json.dumps({{"first_render_s": first, "rerun_s": rerun, "exceptions": [e.value for e in at.exception],
+                  "heavy_loaded": [name for name in heavy if name in sys.modules]}}))
+"""
+
+# Swaps firestore.client() for an in-memory stub as soon as the app imports firebase_admin.firestore,
+# so the import itself is still paid inside the timed first render
+FIRESTORE_STUB_PRELUDE = """
+import importlib.abc, importlib.machinery
+class _Ref:
+    def __init__(self, docs, key): self.docs, self.key = docs, key
+    def get(self, **kwargs): return _Doc(self.docs.get(self.key))
+    def set(self, data, merge=False): self.docs[self.key] = dict(data)
+class _Doc:
+    def __init__(self, data): self.data, self.exists = data, data is not None
+    def to_dict(self): return dict(self.data)
+class _Collection:
+    def __init__(self, docs): self.docs = docs
+    def document(self, key): return _Ref(self.docs, key)
+class _Db:
+    def __init__(self): self.collections = {}
+    def collection(self, name): return _Collection(self.collections.setdefault(name, {}))
+class _StubFirestore(importlib.abc.MetaPathFinder):
+    def find_spec(self, name, path, target=None):
+        if name != "firebase_admin.firestore": return None
+        spec = importlib.machinery.PathFinder.find_spec(name, path)
+        exec_module = spec.loader.exec_module
+        def patched(module):
+            exec_module(module)
+            module.client = lambda *args, **kwargs: _Db()
+        spec.loader.exec_module = patched
+        return spec
+sys.meta_path.insert(0, _StubFirestore())
+"""
+CREDIT_STORES = {"memory": ("memory", ""), "firestore (stub client)": ("firestore", FIRESTORE_STUB_PRELUDE)}
+
+
+def app_header_imports():
+    # The import statements that run at the top level of app.py on every cold start
+    tree = ast.parse(open(APP_PATH, encoding="utf-8").read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def run_python(code, env=None):
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env={**os.environ, **(env or {})}, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def import_seconds(statements, repeat):
+    # Best of `repeat` fresh interpreters, so the OS file cache is warm but nothing is in sys.modules
+    return min(float(run_python(IMPORT_SNIPPET.format(statements=statements))) for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app import time and first render.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-header-ms", type=float, help="Fail if app.py's top-level imports take longer")
+    parser.add_argument("--max-first-render-ms", type=float, help="Fail if the first render with the Firestore credit store takes longer")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {"imports_ms": {}}
+    for module in ["streamlit"] + HEAVY_MODULES:
+        results["imports_ms"][module] = round(import_seconds(f"import {module}", args.repeat) * 1000, 1)
+        print(f"import {module:26s} {results['imports_ms'][module]:8.1f} ms")
+    header = app_header_imports()
+    results["app_header_ms"] = round(import_seconds(header, args.repeat) * 1000, 1)
+    print(f"app.py top-level imports         {results['app_header_ms']:8.1f} ms")
+
+    results["renders"] = {}
+    for label, (credit_store, prelude) in CREDIT_STORES.items():
+        renders = []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                env = {"JOBLENS_CREDIT_STORE": credit_store, "JOBLENS_CACHE_PATH": os.path.join(cache_dir, "bench.sqlite3")}
+                renders.append(json.loads(run_python(RENDER_SNIPPET.format(prelude=prelude, heavy=HEAVY_MODULES, app=APP_PATH), env)))
+        best = min(renders, key=lambda render: render["first_render_s"])
+        render = results["renders"][credit_store] = {
+            "first_render_ms": round(best["first_render_s"] * 1000, 1), "rerun_ms": round(min(r["rerun_s"] for r in renders) * 1000, 1),
+            "heavy_loaded_on_first_render": best["heavy_loaded"], "exceptions": best["exceptions"]}
+        print(f"credits: {label}")
+        print(f"  first render (fresh process)   {render['first_render_ms']:8.1f} ms")
+        print(f"  warm rerun                     {render['rerun_ms']:8.1f} ms")
+        print(f"  heavy modules loaded by the first page: {', '.join(render['heavy_loaded_on_first_render']) or 'none'}")
+        if render["exceptions"]: print(f"  app raised: {render['exceptions']}")
+    # The deployed app keeps credits in Firestore, so that is the path the limits apply to
+    production = results["renders"]["firestore"]
+    print("note: firestore.client() is stubbed, so credential checks and Firestore round trips are not included")
+    results.update(first_render_ms=production["first_render_ms"], rerun_ms=production["rerun_ms"])
+
+    if args.output:
+        with open(args.output, "w") as f: json.dump(results, f, indent=2)
+    failures = []
+    if args.max_header_ms is not None and results["app_header_ms"] > args.max_header_ms: failures.append(f"app.py imports {results['app_header_ms']} ms > {args.max_header_ms} ms")
+    if args.max_first_render_ms is not None and results["first_render_ms"] > args.max_first_render_ms: failures.append(f"first render {results['first_render_ms']} ms > {args.max_first_render_ms} ms")
+    failures += [f"app raised during render with {store} credits" for store, render in results["renders"].items() if render["exceptions"]]
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
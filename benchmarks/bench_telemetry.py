@@ -0,0 +1,60 @@
+# benchmarks/bench_telemetry.py
+# Per-call cost of telemetry.span and telemetry.count, single-threaded and with
+# several threads recording at once, against an uninstrumented loop. The ring
+# buffer is filled first so appends also pay for eviction, as in a long-running app.
+#
+#   python benchmarks/bench_telemetry.py --calls 200000 --threads 8
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetry import Telemetry, request_context
+
+
+def per_call_ns(fn, calls, threads=1):
+    def run():
+        for _ in range(calls // threads): fn()
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers: worker.start()
+    for worker in workers: worker.join()
+    return (time.perf_counter() - started) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure telemetry recording overhead.")
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    telemetry = Telemetry()
+    for _ in range(telemetry.capacity): telemetry.record("warmup", 0.001)
+
+    def empty(): pass
+
+    def one_span():
+        with telemetry.span("bench.stage"): pass
+
+    def one_count(): telemetry.count("bench.event")
+
+    results = {}
+    with request_context("bench-request"):
+        for name, fn in (("baseline", empty), ("span", one_span), ("count", one_count)):
+            results[name] = {"single_thread_ns": round(per_call_ns(fn, args.calls), 1), f"{args.threads}_threads_ns": round(per_call_ns(fn, args.calls, args.threads), 1)}
+            print(f"{name:9s} {results[name]['single_thread_ns']:8.1f} ns/call   {results[name][f'{args.threads}_threads_ns']:8.1f} ns/call with {args.threads} threads")
+    started = time.perf_counter()
+    summary = telemetry.stage_summary()
+    print(f"stage_summary over a full {telemetry.capacity}-span buffer: {(time.perf_counter() - started) * 1000:.1f} ms ({len(summary)} stages)")
+    if args.output:
+        with open(args.output, "w") as f: json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
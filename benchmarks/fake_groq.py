@@ -0,0 +1,152 @@
+# benchmarks/fake_groq.py
+# Local stand-in for the Groq chat-completions endpoint (OpenAI-compatible JSON),
+# with injectable latency, throttling (429), server errors and truncated replies.
+# Supports stream=True (server-sent chunks) and continuing from an assistant prefill.
+# Point the groq client at it with groq.Groq(api_key="fake", base_url=server.base_url).
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+
+def render_analysis(rng):
+    return {
+        "resume_match_score": rng.randint(40, 95),
+        "match_analysis": "Strong overlap on Python, SQL and machine learning; limited evidence of production MLOps. " * 3,
+        "updated_resume_content": "\n".join(f"- Built {rng.choice(['forecasting', 'ranking', 'NLP'])} models in Python & SQL, improving KPI {i} by {rng.randint(5, 40)}%" for i in range(25)),
+        "cover_letter_content": "Dear Hiring Manager,\n\n" + "I am excited to apply my experience with data pipelines and machine learning to this role. " * 12,
+    }
+
+
+STREAM_CHUNK_CHARS = 16
+
+
+def completion_text(messages):
+    # The same prompt always gets the same analysis, so a continuation request can pick up where a truncated reply stopped
+    prompt = next((message["content"] for message in messages if message.get("role") == "user"), "")
+    return json.dumps(render_analysis(random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())))
+
+
+class FakeGroqServer:
+    def __init__(self, latency=1.0, latency_jitter=0.3, throttle_rate=0.0, error_rate=0.0, malformed_rate=0.0, first_token_share=0.15, host="127.0.0.1", port=0):
+        # latency: time to generate a whole reply; a streamed reply sends its first chunk after first_token_share of it
+        # malformed_rate: share of 200 replies cut off half-way (finish_reason "length"), as when the model stops early
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.first_token_share = first_token_share
+        self.hits = {"completions": 0, "streams": 0, "continuations": 0, "throttled": 0, "errors": 0, "malformed": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self): return self.start()
+    def __exit__(self, *exc): self.stop()
+
+    def _count(self, key):
+        with self._lock: self.hits[key] += 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args): pass
+
+            def _send(self, status, payload, headers=None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items(): self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path != COMPLETIONS_PATH:
+                    return self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+                latency = max(0.0, random.gauss(server.latency, server.latency * server.latency_jitter))
+                streaming = bool(request.get("stream"))
+                time.sleep(latency * server.first_token_share if streaming else latency)
+                roll = random.random()
+                if roll < server.throttle_rate:
+                    server._count("throttled")
+                    return self._send(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}}, {"Retry-After": "0"})
+                if roll < server.throttle_rate + server.error_rate:
+                    server._count("errors")
+                    return self._send(503, {"error": {"message": "Service unavailable", "type": "internal_server_error"}})
+                messages = request.get("messages", [])
+                content, finish_reason = completion_text(messages), "stop"
+                if messages and messages[-1].get("role") == "assistant" and content.startswith(messages[-1]["content"]):
+                    server._count("continuations")
+                    content = content[len(messages[-1]["content"]):]
+                if random.random() < server.malformed_rate:
+                    server._count("malformed")
+                    content, finish_reason = content[:len(content) // 2], "length"
+                server._count("streams" if streaming else "completions")
+                reply = {"id": f"chatcmpl-{random.getrandbits(64):x}", "created": int(time.time()), "model": request.get("model", "")}
+                if streaming: return self._stream(reply, content, finish_reason, latency * (1 - server.first_token_share))
+                self._send(200, {
+                    **reply, "object": "chat.completion",
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}],
+                    "usage": {"prompt_tokens": 900, "completion_tokens": len(content) // 4, "total_tokens": 900 + len(content) // 4},
+                })
+
+            def _stream(self, reply, content, finish_reason, duration):
+                # Server-sent events, paced evenly over `duration`; the connection closes after [DONE]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+                for piece in pieces + [None]:
+                    last = piece is None
+                    chunk = {**reply, "object": "chat.completion.chunk",
+                             "choices": [{"index": 0, "delta": {} if last else {"content": piece}, "finish_reason": finish_reason if last else None}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if not last: time.sleep(duration / max(1, len(pieces)))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run a local Groq chat-completions stand-in server.")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeGroqServer(latency=args.latency, throttle_rate=args.throttle_rate, error_rate=args.error_rate, malformed_rate=args.malformed_rate, port=args.port).start()
+    print(f"Serving fake Groq on {server.base_url} (set JOBLENS_GROQ_BASE_URL to this)")
+    try: server._thread.join()
+    except KeyboardInterrupt: server.stop()
@@ -0,0 +1,147 @@
+# benchmarks/fake_linkedin.py
+# Local stand-in for the LinkedIn guest job endpoints, with injectable latency,
+# throttling (429) and server errors. Serves keep-alive HTTP/1.1. Job postings are
+# generated, or replayed from recorded HTML (see load_recorded_postings).
+
+import glob
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LIST_PATH = re.compile(r"^/jobs-guest/jobs/api/seeMoreJobPostings/search")
+DETAIL_PATH = re.compile(r"^/jobs-guest/jobs/api/jobPosting/(\d+)")
+PAGE_SIZE = 25
+POSTINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "postings")
+
+
+def render_list_page(start, total_jobs):
+    cards = "".join(
+        f'<li><div class="base-card" data-entity-urn="urn:li:jobPosting:{4000000000 + i}"><h3>Job {i}</h3></div></li>'
+        for i in range(start, min(start + PAGE_SIZE, total_jobs))
+    )
+    return f"<ul>{cards}</ul>" if cards else ""
+
+
+def render_job_posting(job_id):
+    rng = random.Random(job_id)
+    paragraphs = "".join(f"<p>Responsibility {i}: build Python, SQL and machine learning pipelines on AWS.</p>" for i in range(rng.randint(10, 30)))
+    return f"""<section class="top-card-layout">
+<h2 class="top-card-layout__title">Data Scientist {job_id}</h2>
+<a class="topcard__org-name-link" href="#">Company {rng.randint(1, 50)}</a>
+<span class="posted-time-ago__text">{rng.randint(1, 6)} days ago</span>
+<span class="num-applicants__caption">{rng.randint(1, 200)} applicants</span>
+<ul><li class="job-details-jobs-unified-top-card__job-insight">💰 <span>$120K/yr - $150K/yr</span></li></ul>
+</section>
+<div class="show-more-less-html__markup">{paragraphs}</div>"""
+
+
+def load_recorded_postings(directory=POSTINGS_DIR):
+    postings = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, encoding="utf-8") as f: postings.append(f.read())
+    return postings
+
+
+class FakeLinkedInServer:
+    def __init__(self, latency=0.05, latency_jitter=0.5, throttle_rate=0.0, error_rate=0.0, max_concurrent=None, total_jobs=250, postings=None, host="127.0.0.1", port=0):
+        # max_concurrent: requests beyond this many in flight are answered with 429, like a real rate limiter
+        # postings: recorded posting HTML served round-robin by job ID instead of generated pages
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.max_concurrent = max_concurrent
+        self.total_jobs = total_jobs
+        self.postings = postings
+        self.in_flight = 0
+        self.hits = {"list": 0, "detail": 0, "throttled": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self): return self.start()
+    def __exit__(self, *exc): self.stop()
+
+    def _count(self, key):
+        with self._lock: self.hits[key] += 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args): pass
+
+            def _send(self, status, body="", headers=None):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items(): self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                with server._lock: server.in_flight += 1; overloaded = server.max_concurrent is not None and server.in_flight > server.max_concurrent
+                try:
+                    self._respond(overloaded)
+                finally:
+                    with server._lock: server.in_flight -= 1
+
+            def _respond(self, overloaded):
+                time.sleep(max(0.0, random.gauss(server.latency, server.latency * server.latency_jitter)))
+                roll = random.random()
+                if overloaded or roll < server.throttle_rate:
+                    server._count("throttled")
+                    return self._send(429, headers={"Retry-After": "0"})
+                if roll < server.throttle_rate + server.error_rate:
+                    server._count("errors")
+                    return self._send(503)
+                if LIST_PATH.match(self.path):
+                    server._count("list")
+                    start = int(re.search(r"start=(\d+)", self.path).group(1)) if "start=" in self.path else 0
+                    return self._send(200, render_list_page(start, server.total_jobs))
+                detail = DETAIL_PATH.match(self.path)
+                if detail:
+                    server._count("detail")
+                    job_id = detail.group(1)
+                    return self._send(200, server.postings[int(job_id) % len(server.postings)] if server.postings else render_job_posting(job_id))
+                self._send(404)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run a local LinkedIn stand-in server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--throttle-rate", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrent", type=int, default=None)
+    parser.add_argument("--recorded", action="store_true", help="Serve the recorded postings in fixtures/postings")
+    args = parser.parse_args()
+    server = FakeLinkedInServer(latency=args.latency, throttle_rate=args.throttle_rate, error_rate=args.error_rate, max_concurrent=args.max_concurrent,
+                                postings=load_recorded_postings() if args.recorded else None, port=args.port).start()
+    print(f"Serving fake LinkedIn on {server.base_url} (set JOBLENS_LINKEDIN_BASE_URL to this)")
+    try: server._thread.join()
+    except KeyboardInterrupt: server.stop()
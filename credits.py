@@ -0,0 +1,167 @@
+# credits.py
+
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+
+from telemetry import count, span
+
+logger = logging.getLogger(__name__)
+
+# Firestore rejects batches with more than 500 writes
+FIRESTORE_BATCH_LIMIT = 500
+
+
+class FirestoreCreditStore:
+    """Credit documents in the Firestore `users` collection (works against the emulator via FIRESTORE_EMULATOR_HOST)."""
+
+    def __init__(self, db, default_limit, collection="users"):
+        self.db = db
+        self.default_limit = default_limit
+        self.collection = collection
+
+    def load(self, ip):
+        user_ref = self.db.collection(self.collection).document(ip)
+        with span("firestore.user_read"): user_doc = user_ref.get()
+        if user_doc.exists:
+            user_data = user_doc.to_dict(); user_data.setdefault("credit_limit", self.default_limit); return user_data
+        default_data = {"credits_used": 0, "credit_limit": self.default_limit, "last_seen": datetime.now().isoformat()}
+        user_ref.set(default_data); return default_data
+
+    def add_usage(self, usage, written):
+        # Server-side increments need no read, so one batch covers many users without a transaction.
+        # IPs are added to `written` as their chunk commits, so a failure part-way can be retried without double counting.
+        from firebase_admin import firestore
+        items = list(usage.items())
+        for i in range(0, len(items), FIRESTORE_BATCH_LIMIT):
+            chunk = items[i:i + FIRESTORE_BATCH_LIMIT]
+            batch = self.db.batch()
+            for ip, credits in chunk:
+                batch.update(self.db.collection(self.collection).document(ip), {"credits_used": firestore.Increment(credits), "last_seen": datetime.now().isoformat()})
+            with span("firestore.usage_write"): batch.commit()
+            written.update(ip for ip, _ in chunk)
+
+
+class InMemoryCreditStore:
+    """Drop-in stand-in for FirestoreCreditStore, for local runs and benchmarks."""
+
+    def __init__(self, default_limit):
+        self.default_limit = default_limit
+        self.users = {}
+        self.reads = self.writes = 0
+        self._lock = threading.Lock()
+
+    def load(self, ip):
+        with self._lock:
+            self.reads += 1
+            user = self.users.setdefault(ip, {"credits_used": 0, "credit_limit": self.default_limit, "last_seen": datetime.now().isoformat()})
+            return dict(user)
+
+    def add_usage(self, usage, written):
+        with self._lock:
+            self.writes += 1
+            for ip, credits in usage.items():
+                self.users[ip]["credits_used"] += credits
+                self.users[ip]["last_seen"] = datetime.now().isoformat()
+                written.add(ip)
+
+
+class CreditService:
+    """Cached, write-behind credit accounting over a credit store.
+
+    User documents are cached for `ttl_seconds`, so page reruns don't hit the
+    store. Starting an analysis reserves credits against a fresh read, which makes
+    concurrent sessions in this process unable to overspend `credit_limit`.
+    Completing it turns the used part of the reservation into pending usage, and
+    a background thread flushes all pending usage in one batched write every
+    `flush_interval` seconds (and at exit).
+    """
+
+    def __init__(self, store, ttl_seconds=30.0, flush_interval=2.0):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()  # Serializes fresh reads with flushes so pending usage is never counted twice
+        self._users = {}     # ip -> (user document, fetched_at)
+        self._reserved = {}  # ip -> credits held by analyses in progress
+        self._pending = {}   # ip -> credits used but not yet written to the store
+        self._flushing = {}  # ip -> credits being written by the current flush
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="credit-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def get_user(self, ip):
+        """User document with unflushed usage applied; served from cache while fresh."""
+        with self._lock: cached = self._users.get(ip)
+        if cached is None or time.monotonic() - cached[1] >= self.ttl_seconds: count("credit_cache.miss"); cached = self._refresh(ip)
+        else: count("credit_cache.hit")
+        with self._lock:
+            user = dict(cached[0])
+            user["credits_used"] = user.get("credits_used", 0) + self._unflushed(ip)
+            return user
+
+    def credits_left(self, ip):
+        user = self.get_user(ip)
+        with self._lock:
+            return user["credit_limit"] - user["credits_used"] - self._reserved.get(ip, 0)
+
+    def reserve(self, ip, credits):
+        """Hold `credits` for an analysis; False if the user can't afford them."""
+        user = self._refresh(ip)[0]
+        with self._lock:
+            left = user["credit_limit"] - user.get("credits_used", 0) - self._unflushed(ip) - self._reserved.get(ip, 0)
+            if credits > left: return False
+            self._reserved[ip] = self._reserved.get(ip, 0) + credits
+            return True
+
+    def settle(self, ip, reserved, used):
+        """Release a reservation and record the credits that were actually used."""
+        with self._lock:
+            self._reserved[ip] = max(0, self._reserved.get(ip, 0) - reserved)
+            if used > 0: self._pending[ip] = self._pending.get(ip, 0) + used
+
+    def invalidate(self, ip=None):
+        # Call after editing user documents directly (e.g. from the admin panel)
+        with self._lock:
+            if ip is None: self._users.clear()
+            else: self._users.pop(ip, None)
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                usage = self._flushing = self._pending
+                self._pending = {}
+            if not usage: return
+            written = set()
+            try:
+                self.store.add_usage(usage, written)
+            except Exception:
+                logger.exception("Credit flush failed; will retry")
+            with self._lock:
+                for ip, credits in usage.items():
+                    # Only usage that never reached the store is retried; committed increments must not be sent again
+                    if ip not in written: self._pending[ip] = self._pending.get(ip, 0) + credits
+                    elif ip in self._users: self._users[ip][0]["credits_used"] = self._users[ip][0].get("credits_used", 0) + credits
+                self._flushing = {}
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+    def _refresh(self, ip):
+        with self._io_lock:
+            cached = (self.store.load(ip), time.monotonic())
+            with self._lock: self._users[ip] = cached
+            return cached
+
+    def _unflushed(self, ip):
+        # Called with the lock held
+        return self._pending.get(ip, 0) + self._flushing.get(ip, 0)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
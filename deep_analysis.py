@@ -0,0 +1,111 @@
+# deep_analysis.py
+
+import time
+
+from analysis_cache import analysis_key
+from json_stream import IncrementalJSONObject
+from telemetry import count, record, span
+
+
+def escape_latex(text: str) -> str:
+    if not isinstance(text, str): return ""
+    return text.replace('\\', r'\textbackslash{}').replace('{', r'\{').replace('}', r'\}').replace('&', r'\&').replace('%', r'\%').replace('$', r'\$').replace('#', r'\#').replace('_', r'\_').replace('~', r'\textasciitilde{}').replace('^', r'\textasciicircum{}')
+
+
+ANALYSIS_MODEL = "llama-3.1-8b-instant"
+PROMPT_VERSION = 2  # Bump whenever the prompt or LaTeX template changes so cached results are not reused
+SYSTEM_PROMPT = ("You are a career coach. Respond with a single, valid JSON object and nothing else, with its keys in this order: "
+                 "resume_match_score, match_analysis, updated_resume_content, cover_letter_content.")
+REQUIRED_FIELDS = ("resume_match_score", "match_analysis")  # Enough to show a result while the long fields are still generating
+MAX_ATTEMPTS = 3
+UPDATE_INTERVAL = 0.25  # Seconds between on_update calls while a string field is streaming
+
+
+def _request_completion(client, messages, parser, stream, on_chunk):
+    # Feeds the reply into `parser`, calling on_chunk(completed_keys) as text arrives
+    if not stream:
+        response = client.chat.completions.create(model=ANALYSIS_MODEL, messages=messages, temperature=0.4, timeout=90.0)
+        on_chunk(parser.feed(response.choices[0].message.content or ""))
+        return
+    resuming, first = bool(parser.text), True
+    for chunk in client.chat.completions.create(model=ANALYSIS_MODEL, messages=messages, temperature=0.4, timeout=90.0, stream=True):
+        text = chunk.choices[0].delta.content if chunk.choices else None
+        if not text: continue
+        # A continuation that opens a new object means the model ignored the prefill and started over
+        if resuming and first and text.lstrip().startswith('{"'): parser.reset()
+        first = False
+        on_chunk(parser.feed(text))
+
+
+def _finish(fields, latex_template, truncated=False):
+    analysis_json = dict(fields)
+    resume_content = analysis_json.get('updated_resume_content', 'Error: Content not generated.')
+    cover_letter_content = analysis_json.get('cover_letter_content', 'Error: Content not generated.')
+    analysis_json['updated_resume_latex'] = latex_template % escape_latex(resume_content)
+    analysis_json['cover_letter_latex'] = latex_template % escape_latex(cover_letter_content)
+    analysis_json['status'] = 'success'
+    if truncated: analysis_json['truncated'] = True
+    return analysis_json
+
+
+def run_deep_analysis(client, job_desc, resume_text, on_update=None, stream=True):
+    # Streams the completion and calls on_update(fields_so_far) as fields arrive, so the score and
+    # match analysis can be shown before the resume and cover letter are written. A reply cut off
+    # mid-way is resumed from where it stopped rather than regenerated; if attempts run out, whatever
+    # arrived is kept as long as it includes REQUIRED_FIELDS (marked 'truncated').
+    latex_template = r"""\documentclass[a4paper,11pt]{article}
+\usepackage[T1]{fontenc}
+\usepackage{geometry}
+\geometry{a4paper, total={170mm,257mm}, left=20mm, top=20mm}
+\usepackage{enumitem}
+\setlist[itemize]{leftmargin=*}
+\linespread{1.15}
+\begin{document}
+%s
+\end{document}
+"""
+    prompt = f"""You are an expert career coach and LaTeX resume formatter... (rest of prompt is unchanged)"""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}]
+    parser, started, last_exception = IncrementalJSONObject(), time.perf_counter(), None
+    progress = {'summary_recorded': False, 'last_update': time.monotonic()}
+
+    def on_chunk(completed):
+        if not progress['summary_recorded'] and all(field in parser.fields for field in REQUIRED_FIELDS):
+            progress['summary_recorded'] = True
+            record("groq.time_to_summary", time.perf_counter() - started)
+        now = time.monotonic()
+        if on_update is not None and (completed or now - progress['last_update'] >= UPDATE_INTERVAL):
+            progress['last_update'] = now
+            on_update(parser.snapshot())
+
+    for attempt in range(MAX_ATTEMPTS):
+        request = messages
+        if parser.text and not parser.done:
+            # Continue the cut-off reply: the model picks up after the text it already produced
+            count("groq.resume")
+            request = messages + [{"role": "assistant", "content": parser.text}]
+        elif parser.done: parser.reset()  # A complete object without the required fields; generate it again
+        try:
+            with span("groq.completion"): _request_completion(client, request, parser, stream, on_chunk)
+        except Exception as e:
+            last_exception = e
+        if parser.done and all(field in parser.fields for field in REQUIRED_FIELDS): return _finish(parser.fields, latex_template)
+        if attempt < MAX_ATTEMPTS - 1:
+            count("groq.retry")
+            if not parser.text:  # Nothing to resume from, so back off before asking again
+                with span("groq.retry_wait"): time.sleep(1)
+    fields = parser.snapshot()
+    if all(field in fields for field in REQUIRED_FIELDS):
+        count("groq.repaired")
+        return _finish(fields, latex_template, truncated=True)
+    count("groq.failure")
+    details = str(last_exception) if last_exception else "the response was incomplete"
+    return {"status": "error", "match_analysis": f"An error occurred during analysis after multiple retries. Details: {details}"}
+
+
+def run_cached_analysis(client, job_desc, resume_text, analysis_cache, on_update=None):
+    # Identical (job, resume, model, prompt) requests are served from the cache, and concurrent
+    # duplicates share one in-flight Groq call. Only complete, successful analyses are cached.
+    key = analysis_key(job_desc, resume_text, ANALYSIS_MODEL, PROMPT_VERSION)
+    return analysis_cache.get_or_compute(key, lambda: run_deep_analysis(client, job_desc, resume_text, on_update),
+                                         cacheable=lambda result: result.get('status') == 'success' and not result.get('truncated'))
@@ -0,0 +1,197 @@
+# http_engine.py
+
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from telemetry import count, span
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# One engine serves every session, so the bucket sits well above what a single search needs
+# (the old 8-thread fetcher managed ~40 req/s at 0.2 s latency); the AIMD limit reacts to 429s
+DEFAULT_REQUESTS_PER_SECOND = 100.0
+DEFAULT_BURST = 50
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+class FetchError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """Per-host request pacing: `rate` tokens per second, bursting up to `burst`."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AIMDLimiter:
+    """Adaptive per-host concurrency limit.
+
+    The limit grows by one after a full window of fast, successful responses and
+    is multiplied by `decrease` on throttling, server errors, timeouts or latency
+    above target (at most once per `cooldown` seconds, so one burst of failures
+    counts once).
+    """
+
+    def __init__(self, initial, minimum, maximum, latency_target, cooldown=1.0, decrease=0.5):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.decrease = decrease
+        self.in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, healthy, latency):
+        async with self._cond:
+            self.in_flight -= 1
+            if healthy and latency <= self.latency_target:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self._successes = 0
+            else:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, int(self.limit * self.decrease))
+                    self._last_decrease = now
+                self._successes = 0
+            self._cond.notify_all()
+
+
+class HttpEngine:
+    """Asyncio fetch engine with one pooled keep-alive client for all sessions.
+
+    The event loop runs on a daemon thread, so synchronous callers (the Streamlit
+    script thread or worker threads) use `get_text` / `submit` and never touch the
+    loop directly. Each host gets its own token bucket and AIMD concurrency limit;
+    throttled, 5xx and transport failures are retried with jittered exponential
+    backoff, honouring Retry-After when the server sends one.
+    """
+
+    def __init__(self, *, requests_per_second=DEFAULT_REQUESTS_PER_SECOND, burst=DEFAULT_BURST, initial_concurrency=8, min_concurrency=1,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, latency_target=3.0, limit_decrease=0.75, max_retries=3, backoff_base=0.5, backoff_cap=20.0,
+                 timeout=15.0, headers=None):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.limit_decrease = limit_decrease
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._client = None
+        self._hosts = {}
+        self._counters = {"requests": 0, "retries": 0, "throttled": 0, "server_errors": 0, "transport_errors": 0, "failures": 0}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="http-engine", daemon=True)
+        self._thread.start()
+
+    # --- Synchronous bridge ---
+    def submit(self, url, timeout=None):
+        return asyncio.run_coroutine_threadsafe(self.fetch(url, timeout=timeout), self._loop)
+
+    def get_text(self, url, timeout=None):
+        return self.submit(url, timeout=timeout).result()
+
+    def stats(self):
+        hosts = {host: {"limit": limiter.limit, "in_flight": limiter.in_flight} for host, (limiter, _) in list(self._hosts.items())}
+        return {**self._counters, "hosts": hosts}
+
+    def close(self):
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    # --- Async internals (run on the engine loop) ---
+    def _host_controls(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            limiter = AIMDLimiter(self.initial_concurrency, self.min_concurrency, self.max_concurrency, self.latency_target, decrease=self.limit_decrease)
+            self._hosts[host] = (limiter, TokenBucket(self.requests_per_second, self.burst))
+        return self._hosts[host]
+
+    def _get_client(self):
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_concurrency * 2, max_keepalive_connections=self.max_concurrency)
+            self._client = httpx.AsyncClient(headers=self.headers, limits=limits, follow_redirects=True)
+        return self._client
+
+    def _count(self, name):
+        self._counters[name] += 1
+        count(f"http.{name}")
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after:
+            try: return min(self.backoff_cap, float(retry_after)) + random.uniform(0, self.backoff_base)
+            except ValueError: pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def fetch(self, url, timeout=None):
+        limiter, bucket = self._host_controls(url)
+        client = self._get_client()
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            with span("http.rate_limit_wait"): await bucket.acquire()
+            with span("http.concurrency_wait"): await limiter.acquire()
+            started = time.monotonic()
+            healthy, retry_after = False, None
+            self._count("requests")
+            try:
+                response = await client.get(url, timeout=timeout or self.timeout)
+                if response.status_code in RETRYABLE_STATUS:
+                    self._count("throttled" if response.status_code == 429 else "server_errors")
+                    retry_after = response.headers.get("Retry-After")
+                    last_error = FetchError(f"HTTP {response.status_code} for {url}", response.status_code)
+                elif response.is_error:
+                    healthy = True  # A 4xx says nothing about host load, so don't back off on it
+                    self._count("failures")
+                    raise FetchError(f"HTTP {response.status_code} for {url}", response.status_code)
+                else:
+                    healthy = True
+                    return response.text
+            except httpx.HTTPError as e:
+                self._count("transport_errors")
+                last_error = FetchError(f"{type(e).__name__} for {url}: {e}")
+            finally:
+                await limiter.release(healthy, time.monotonic() - started)
+            if attempt < self.max_retries:
+                self._count("retries")
+                with span("http.backoff"): await asyncio.sleep(self._backoff(attempt, retry_after))
+        self._count("failures")
+        raise last_error
@@ -0,0 +1,110 @@
+# job_extractor.py
+
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml builds trees several times faster than the stdlib parser; fall back if it isn't installed
+try:
+    from lxml import etree
+    PARSER = "lxml"
+except ImportError:
+    etree = None
+    PARSER = "html.parser"
+
+# (tag, class) of every element a job posting needs -> the field it feeds
+POSTING_FIELDS = {
+    ("h2", "top-card-layout__title"): "job_title",
+    ("a", "topcard__org-name-link"): "company_name",
+    ("li", "job-details-jobs-unified-top-card__job-insight"): "salary",
+    ("div", "show-more-less-html__markup"): "job_desc",
+    ("span", "posted-time-ago__text"): "hours_posted",
+    ("span", "num-applicants__caption"): "applicants_count",
+}
+_POSTING_CLASSES = {css_class for _, css_class in POSTING_FIELDS}
+
+
+def _has_class(targets):
+    # The strainer sees the raw class attribute, e.g. "top-card-layout__title font-sans"
+    return lambda value: value is not None and not targets.isdisjoint(value.split())
+
+
+POSTING_STRAINER = SoupStrainer(class_=_has_class(_POSTING_CLASSES))
+LIST_STRAINER = SoupStrainer("div", class_=_has_class({"base-card"}))
+
+
+def parse_time_posted(time_text):
+    if not time_text: return None
+    num_match = re.search(r'\d+', time_text)
+    if not num_match: return None
+    num = int(num_match.group(0))
+    time_text = time_text.lower()
+    if 'second' in time_text or 'minute' in time_text or 'hour' in time_text: return 0
+    elif 'day' in time_text: return num * 24
+    elif 'week' in time_text: return num * 7 * 24
+    elif 'month' in time_text: return num * 30 * 24
+    else: return None
+
+
+def parse_num_applicants(applicant_text):
+    if not applicant_text: return None
+    num_match = re.search(r'\d+', applicant_text)
+    if num_match: return int(num_match.group(0))
+    else: return None
+
+
+class _JobIdCollector:
+    # lxml parser target: receives start-tag events only, so no tree is ever built
+    def __init__(self): self.job_ids = []
+    def start(self, tag, attrib):
+        if tag == "div" and "base-card" in (attrib.get("class") or "").split():
+            job_id = attrib.get("data-entity-urn", "").split(":")[-1]
+            if job_id: self.job_ids.append(job_id)
+    def end(self, tag): pass
+    def data(self, data): pass
+    def close(self): return self.job_ids
+
+
+def extract_job_ids(list_html):
+    """Job IDs from a seeMoreJobPostings list page, in page order."""
+    if not list_html.strip(): return []
+    if etree is not None:
+        parser = etree.HTMLParser(target=_JobIdCollector())
+        parser.feed(list_html)
+        return parser.close()
+    soup = BeautifulSoup(list_html, PARSER, parse_only=LIST_STRAINER)
+    job_ids = []
+    for card in soup.find_all("div", recursive=False):
+        job_id = card.get("data-entity-urn", "").split(":")[-1]
+        if job_id: job_ids.append(job_id)
+    return job_ids
+
+
+def extract_job_post(job_id, posting_html):
+    """Parse a jobPosting page into the job_post dict used across the app.
+
+    Only the elements listed in POSTING_FIELDS are built into the tree, and they
+    are read in a single pass; the first match per field wins, as with `find`.
+    """
+    soup = BeautifulSoup(posting_html, PARSER, parse_only=POSTING_STRAINER)
+    found = {}
+    for tag in soup.find_all(True):
+        for css_class in tag.get("class", ()):
+            field = POSTING_FIELDS.get((tag.name, css_class))
+            if field is None: continue
+            if field == "salary":
+                if "salary" not in found and "💰" in tag.get_text():
+                    span = tag.find("span")
+                    found["salary"] = span.text.strip() if span else None
+            elif field not in found:
+                found[field] = tag
+            break
+    return {
+        'job_id': job_id, 'job_link': f"https://www.linkedin.com/jobs/view/{job_id}",
+        'job_title': found["job_title"].text.strip() if "job_title" in found else "N/A",
+        'company_name': found["company_name"].text.strip() if "company_name" in found else "N/A",
+        'salary': found.get("salary"),
+        'job_desc': found["job_desc"].get_text(separator="\n").strip() if "job_desc" in found else "",
+        'hours_posted': parse_time_posted(found["hours_posted"].text.strip() if "hours_posted" in found else None),
+        'applicants_count': parse_num_applicants(found["applicants_count"].text.strip() if "applicants_count" in found else None),
+    }
@@ -0,0 +1,210 @@
+# job_store.py
+
+import hashlib
+import threading
+import time
+from array import array
+
+JOB_LINK_TEMPLATE = "https://www.linkedin.com/jobs/view/{}"
+MISSING = -1  # Code stored for a missing value in the integer columns
+COLUMNS = ["job_id", "job_link", "job_title", "company_name", "salary", "job_desc", "hours_posted", "applicants_count"]
+
+
+class _Categories:
+    # Dictionary encoding: each distinct string is kept once and rows store its integer code.
+    # Codes are reference-counted by the rows using them and reused once no row does
+    __slots__ = ("values", "codes", "refs", "free")
+
+    def __init__(self):
+        self.values, self.codes, self.refs, self.free = [], {}, array("i"), []
+
+    def __len__(self):
+        return len(self.codes)
+
+    def code(self, value):
+        if value is None: return MISSING
+        code = self.codes.get(value)
+        if code is None:
+            if self.free:
+                code = self.free.pop()
+                self.values[code], self.refs[code] = value, 0
+            else:
+                code = len(self.values)
+                self.values.append(value)
+                self.refs.append(0)
+            self.codes[value] = code
+        self.refs[code] += 1
+        return code
+
+    def release(self, code):
+        if code == MISSING: return
+        self.refs[code] -= 1
+        if self.refs[code] == 0:
+            del self.codes[self.values[code]]
+            self.values[code] = None
+            self.free.append(code)
+
+    def value(self, code):
+        return None if code == MISSING else self.values[code]
+
+
+class JobStore:
+    """Process-wide, deduplicated store of scraped job postings.
+
+    Sessions keep only job IDs and read postings back through `records` and
+    `frame`. Each description is interned by its SHA-256, so a posting seen by
+    many sessions (or reposted under a new ID) is held once; titles, companies and
+    salaries are dictionary-encoded, and hours posted / applicant counts live in
+    integer arrays. Adding a job ID again updates its row in place. Beyond
+    `max_jobs` rows the least recently read tenth is evicted (never the jobs of
+    the `add` that overflowed), so callers must allow for IDs that are no longer
+    present.
+    """
+
+    def __init__(self, max_jobs=20000):
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._slots = {}        # job_id -> row
+        self._free = []         # Rows of evicted jobs, reused before the columns grow
+        self._job_ids = []
+        self._titles, self._companies, self._salaries = _Categories(), _Categories(), _Categories()
+        self._title = array("i")
+        self._company = array("i")
+        self._salary = array("i")
+        self._hours = array("i")
+        self._applicants = array("i")
+        self._desc = array("i")
+        self._read_at = array("d")
+        # Interned descriptions, reference-counted by the rows that use them
+        self._desc_codes = {}   # sha256 digest -> code
+        self._desc_digests = []
+        self._desc_texts = []
+        self._desc_refs = array("i")
+        self._desc_free = []
+
+    def __len__(self):
+        return len(self._slots)
+
+    def add(self, job_posts):
+        """Store (or refresh) postings; returns their job IDs in order."""
+        job_ids, now = [], time.time()
+        with self._lock:
+            for post in job_posts:
+                job_id = post['job_id']
+                values = (self._titles.code(post.get('job_title')), self._companies.code(post.get('company_name')), self._salaries.code(post.get('salary')),
+                          MISSING if post.get('hours_posted') is None else int(post['hours_posted']),
+                          MISSING if post.get('applicants_count') is None else int(post['applicants_count']),
+                          self._intern(post.get('job_desc') or ""), now)
+                row = self._slots.get(job_id)
+                if row is not None: self._release(row)
+                elif self._free: row = self._slots[job_id] = self._free.pop()
+                else:
+                    row = self._slots[job_id] = len(self._job_ids)
+                    self._job_ids.append(None)
+                    for column in self._columns(): column.append(MISSING)
+                self._job_ids[row] = job_id
+                for column, value in zip(self._columns(), values): column[row] = value
+                job_ids.append(job_id)
+            if len(self._slots) > self.max_jobs: self._evict(len(self._slots) - self.max_jobs + self.max_jobs // 10, keep=set(job_ids))
+        return job_ids
+
+    def records(self, job_ids, fields=COLUMNS):
+        """Posting dicts for the IDs still in the store, in the given order."""
+        with self._lock:
+            rows = self._touch(job_ids)
+            return [{field: self._value(field, row) for field in fields} for row in rows]
+
+    def frame(self, job_ids):
+        """The jobs as a DataFrame for display: categorical text columns, nullable integer counts."""
+        import numpy as np
+        import pandas as pd
+        with self._lock:
+            rows = np.array(self._touch(job_ids), dtype=np.int64)
+            ids = [self._job_ids[row] for row in rows]
+            columns = {
+                "job_id": ids,
+                "job_link": [JOB_LINK_TEMPLATE.format(job_id) for job_id in ids],
+                "job_title": self._categorical(self._titles, self._title, rows),
+                "company_name": self._categorical(self._companies, self._company, rows),
+                "salary": self._categorical(self._salaries, self._salary, rows),
+                "job_desc": [self._desc_texts[self._desc[row]] for row in rows],
+            }
+            for name, column in (("hours_posted", self._hours), ("applicants_count", self._applicants)):
+                values = np.frombuffer(column, dtype=np.int32)[rows]
+                columns[name] = pd.arrays.IntegerArray(values.copy(), values == MISSING)
+        return pd.DataFrame(columns)
+
+    def stats(self):
+        with self._lock:
+            live_texts = [text for text in self._desc_texts if text is not None]
+            return {"jobs": len(self._slots), "descriptions": len(live_texts), "description_chars": sum(map(len, live_texts)),
+                    "titles": len(self._titles), "companies": len(self._companies)}
+
+    # --- Internals; all called with the lock held ---
+    def _columns(self):
+        return (self._title, self._company, self._salary, self._hours, self._applicants, self._desc, self._read_at)
+
+    def _touch(self, job_ids):
+        now, rows = time.time(), []
+        for job_id in job_ids:
+            row = self._slots.get(job_id)
+            if row is None: continue
+            self._read_at[row] = now
+            rows.append(row)
+        return rows
+
+    def _value(self, field, row):
+        if field == "job_id": return self._job_ids[row]
+        if field == "job_link": return JOB_LINK_TEMPLATE.format(self._job_ids[row])
+        if field == "job_title": return self._titles.value(self._title[row])
+        if field == "company_name": return self._companies.value(self._company[row])
+        if field == "salary": return self._salaries.value(self._salary[row])
+        if field == "job_desc": return self._desc_texts[self._desc[row]]
+        value = (self._hours if field == "hours_posted" else self._applicants)[row]
+        return None if value == MISSING else value
+
+    @staticmethod
+    def _categorical(categories, codes, rows):
+        # Only the categories these rows use, so a page of results doesn't ship the whole vocabulary
+        import numpy as np
+        import pandas as pd
+        used, local_codes = np.unique(np.frombuffer(codes, dtype=np.int32)[rows], return_inverse=True)
+        if used.size and used[0] == MISSING: used, local_codes = used[1:], local_codes - 1
+        return pd.Categorical.from_codes(local_codes, categories=[categories.values[code] for code in used])
+
+    def _intern(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        code = self._desc_codes.get(digest)
+        if code is None:
+            if self._desc_free:
+                code = self._desc_free.pop()
+                self._desc_digests[code], self._desc_texts[code], self._desc_refs[code] = digest, text, 0
+            else:
+                code = len(self._desc_texts)
+                self._desc_digests.append(digest)
+                self._desc_texts.append(text)
+                self._desc_refs.append(0)
+            self._desc_codes[digest] = code
+        self._desc_refs[code] += 1
+        return code
+
+    def _release(self, row):
+        # Drops the row's references to its interned description and category strings
+        self._titles.release(self._title[row])
+        self._companies.release(self._company[row])
+        self._salaries.release(self._salary[row])
+        code = self._desc[row]
+        self._desc_refs[code] -= 1
+        if self._desc_refs[code] == 0:
+            del self._desc_codes[self._desc_digests[code]]
+            self._desc_digests[code] = self._desc_texts[code] = None
+            self._desc_free.append(code)
+
+    def _evict(self, n, keep=()):
+        # Jobs in `keep` were just added and their IDs are about to be returned, so they are never evicted
+        candidates = [job_id for job_id in self._slots if job_id not in keep]
+        for job_id in sorted(candidates, key=lambda job_id: self._read_at[self._slots[job_id]])[:n]:
+            row = self._slots.pop(job_id)
+            self._release(row)
+            self._job_ids[row] = None
+            self._free.append(row)
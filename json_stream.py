@@ -0,0 +1,105 @@
+# json_stream.py
+
+import json
+
+_INVALID = object()  # Marks a member whose value text is not valid JSON
+
+
+class IncrementalJSONObject:
+    """Parses one JSON object while its text is still arriving in chunks.
+
+    Each top-level member is decoded with `json.loads` as soon as its value is
+    complete, so early fields can be used while later ones are still being
+    generated. The top-level string value currently streaming can be read in
+    partial form via `snapshot()`. Every character is scanned once, however the
+    text is chunked. Text before the opening brace (e.g. a stray preamble) is ignored.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget everything fed so far, e.g. when the producer starts the object over."""
+        self.text = ""
+        self.fields = {}
+        self.done = False        # The top-level object has been closed
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key = None         # Key of the top-level member being read
+        self._key_start = None   # Offset of the opening quote of a top-level key
+        self._value_start = None
+        self._value_kind = None  # 'string', 'container' or 'scalar'
+
+    def feed(self, chunk):
+        """Scan `chunk`; returns the names of top-level members completed by it."""
+        self.text += chunk
+        completed = []
+        text, i = self.text, self._pos
+        while i < len(text) and not self.done:
+            char = text[i]
+            if self._in_string:
+                if self._escape: self._escape = False
+                elif char == "\\": self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start is not None:
+                        self._key = self._decode(self._key_start, i + 1)
+                        self._key_start = None
+                    elif self._depth == 1 and self._value_kind == 'string':
+                        self._complete(i + 1, completed)
+            elif not self._started:
+                if char == "{": self._started, self._depth = True, 1
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._key is None: self._key_start = i
+                    elif self._value_start is None: self._value_start, self._value_kind = i, 'string'
+            elif char in "{[":
+                if self._depth == 1 and self._key is not None and self._value_start is None: self._value_start, self._value_kind = i, 'container'
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 1 and self._value_kind == 'scalar': self._complete(i, completed)
+                self._depth -= 1
+                if self._depth == 1 and self._value_kind == 'container': self._complete(i + 1, completed)
+                elif self._depth == 0: self.done = True
+            elif self._depth == 1:
+                if char == "," and self._value_kind == 'scalar': self._complete(i, completed)
+                elif char not in " \t\r\n:," and self._key is not None and self._value_start is None: self._value_start, self._value_kind = i, 'scalar'
+            i += 1
+        self._pos = i
+        return completed
+
+    def partial(self):
+        """(key, text so far) for the top-level string value being streamed, else None."""
+        if not (self._in_string and self._depth == 1 and self._value_kind == 'string'): return None
+        raw = self.text[self._value_start:]
+        # A trailing escape sequence may be cut off mid-way (e.g. "\u00"); drop it until it has arrived
+        for cut in range(min(6, len(raw) - 1) + 1):
+            try:
+                return self._key, json.loads(raw[:len(raw) - cut] + '"')
+            except ValueError:
+                continue
+        return None
+
+    def snapshot(self):
+        """Completed members plus the partial string value, if one is streaming."""
+        fields = dict(self.fields)
+        partial = self.partial()
+        if partial is not None: fields[partial[0]] = partial[1]
+        return fields
+
+    def _complete(self, end, completed):
+        value = self._decode(self._value_start, end)
+        if value is not _INVALID:
+            self.fields[self._key] = value
+            completed.append(self._key)
+        self._key, self._value_start, self._value_kind = None, None, None
+
+    def _decode(self, start, end):
+        try:
+            return json.loads(self.text[start:end])
+        except ValueError:
+            return _INVALID
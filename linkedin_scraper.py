@@ -0,0 +1,77 @@
+# linkedin_scraper.py
+
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from http_engine import FetchError
+from job_extractor import extract_job_ids, extract_job_post
+from telemetry import count, span
+
+LINKEDIN_API_BASE = "https://www.linkedin.com"
+LIST_PAGE_SIZE = 25
+
+
+def fetch_job_details(job_id, engine, base_url=LINKEDIN_API_BASE):
+    try:
+        job_url = f"{base_url}/jobs-guest/jobs/api/jobPosting/{job_id}"
+        with span("linkedin.detail_http"): job_html = engine.get_text(job_url, timeout=15)
+        with span("parse.job_post"): return extract_job_post(job_id, job_html)
+    except FetchError:
+        return None
+
+
+def stream_linkedin_jobs(title, location, num_pages, engine, job_cache, base_url=LINKEDIN_API_BASE):
+    # Producer/consumer pipeline: each list page hands its new job IDs to the detail
+    # workers as soon as it is parsed, so list paging overlaps with detail fetching.
+    # Request pacing is left to the HTTP engine's per-host token bucket. Yields
+    # ('page', pages_done, ids_found), ('job', job_post or None) and ('error', exception)
+    # events, in completion order.
+    events = queue.Queue()
+
+    def fetch_and_cache(job_id):
+        job_post = None
+        try:
+            job_post = fetch_job_details(job_id, engine, base_url)
+            if job_post: job_cache.set(job_id, job_post)
+        finally:
+            events.put(('job', job_post))
+
+    def produce():
+        seen_ids, start = set(), 0
+        try:
+            # Workers mostly wait on the engine; its AIMD limiter decides how many requests are really in flight
+            with ThreadPoolExecutor(max_workers=engine.max_concurrency) as executor:
+                for page in range(num_pages):
+                    list_url = f"{base_url}/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={title}&location={location}&start={start}"
+                    try:
+                        with span("linkedin.list_http"): list_html = engine.get_text(list_url, timeout=10)
+                    except FetchError as e:
+                        events.put(('error', e))
+                        break
+                    with span("parse.list_page"): page_ids = extract_job_ids(list_html)
+                    if not page_ids: break
+                    new_ids = []
+                    for job_id in page_ids:
+                        if job_id not in seen_ids: seen_ids.add(job_id); new_ids.append(job_id)
+                    # Announce the page before its postings, so consumers never see more jobs than IDs found
+                    events.put(('page', page + 1, len(seen_ids)))
+                    # Only postings missing from the shared cache need a detail request
+                    cached_posts = job_cache.get_many(new_ids)
+                    count("job_cache.hit", len(cached_posts)); count("job_cache.miss", len(new_ids) - len(cached_posts))
+                    for job_id in new_ids:
+                        if job_id in cached_posts: events.put(('job', cached_posts[job_id]))
+                        else: executor.submit(contextvars.copy_context().run, fetch_and_cache, job_id)
+                    start += LIST_PAGE_SIZE
+        except Exception as e:
+            events.put(('error', e))
+        finally:
+            events.put(('done',))
+
+    # Worker threads run in copies of the caller's context so their spans keep its request ID
+    threading.Thread(target=contextvars.copy_context().run, args=(produce,), name="linkedin-list-producer", daemon=True).start()
+    while True:
+        event = events.get()
+        if event[0] == 'done': return
+        yield event
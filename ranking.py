@@ -0,0 +1,63 @@
+# ranking.py
+
+import numpy as np
+import pandas as pd
+
+from vocabulary import SKILL_KEYWORDS, STOP_WORDS, TOKEN_PATTERN
+
+
+def _tokens(texts):
+    # One row per (document position, token), stop words removed
+    tokens = pd.Series(texts, dtype=object).fillna("").astype(str).str.lower().str.findall(TOKEN_PATTERN)
+    exploded = tokens.reset_index(drop=True).explode().dropna()
+    return exploded[~exploded.isin(STOP_WORDS)]
+
+
+def rank_jobs(job_texts, resume_text, cosine_weight=0.6, resume_profile=None):
+    """Score every job text against the resume in one batched pass, 0-100.
+
+    Combines TF-IDF cosine similarity (sublinear tf, idf over the scraped batch,
+    scaled so the best job in the batch scores 1) with the share of a job's skill
+    keywords that also appear in the resume. Fully local; no network calls.
+    Pass the resume's `resume_ingest.ResumeProfile` to skip re-tokenizing it.
+    """
+    n_docs = len(job_texts)
+    if n_docs == 0: return np.zeros(0)
+    doc_tokens = _tokens(job_texts)
+    codes, vocab = pd.factorize(doc_tokens.to_numpy())
+    n_terms = len(vocab)
+    if n_terms == 0: return np.zeros(n_docs)
+
+    # Sparse doc-term counts as parallel (row, col, count) arrays
+    pairs, counts = np.unique(doc_tokens.index.to_numpy(dtype=np.int64) * n_terms + codes, return_counts=True)
+    rows, cols = pairs // n_terms, pairs % n_terms
+    doc_freq = np.bincount(cols, minlength=n_terms)
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+    weights = (1 + np.log(counts)) * idf[cols]
+    doc_norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+
+    if resume_profile is not None: resume_counts = pd.Series(resume_profile.counts, dtype=np.int64)
+    else: resume_counts = _tokens([resume_text]).value_counts()
+    resume_cols = pd.Index(vocab).get_indexer(resume_counts.index)
+    known = resume_cols >= 0
+    resume_vec = np.zeros(n_terms)
+    resume_vec[resume_cols[known]] = (1 + np.log(resume_counts.to_numpy()[known])) * idf[resume_cols[known]]
+    # Resume terms unseen in the batch still count towards its norm, at the maximum idf
+    unseen_weight = (1 + np.log(resume_counts.to_numpy()[~known])) * (np.log(1 + n_docs) + 1)
+    resume_norm = np.sqrt((resume_vec ** 2).sum() + (unseen_weight ** 2).sum())
+
+    dots = np.bincount(rows, weights=weights * resume_vec[cols], minlength=n_docs)
+    denominator = doc_norms * resume_norm
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine = np.where(denominator > 0, dots / denominator, 0.0)
+    if cosine.max() > 0: cosine = cosine / cosine.max()
+
+    is_skill = np.isin(vocab, list(SKILL_KEYWORDS))
+    in_resume = np.zeros(n_terms, dtype=bool)
+    in_resume[resume_cols[known]] = True
+    job_skills = np.bincount(rows, weights=is_skill[cols], minlength=n_docs)
+    matched_skills = np.bincount(rows, weights=(is_skill & in_resume)[cols], minlength=n_docs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skill_overlap = np.where(job_skills > 0, matched_skills / job_skills, cosine)
+
+    return np.round(100 * (cosine_weight * cosine + (1 - cosine_weight) * skill_overlap), 1)
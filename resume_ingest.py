@@ -0,0 +1,110 @@
+# resume_ingest.py
+
+import hashlib
+import io
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+
+from telemetry import count, span
+from vocabulary import tokenize
+
+
+def normalize_resume_text(text):
+    # PDF extraction leaves ligatures, NULs, runs of spaces and long blank gaps between pages
+    text = unicodedata.normalize("NFKC", text or "").replace("\x00", "")
+    lines = (re.sub(r"[^\S\n]+", " ", line).strip() for line in text.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _extract_pages(data, start, stop):
+    # Runs in a worker process, so it re-opens the PDF from its bytes
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+class ResumeProfile:
+    """Token counts of a resume, as `ranking.rank_jobs` would extract them."""
+    __slots__ = ("counts",)
+
+    def __init__(self, text):
+        self.counts = dict(Counter(tokenize(text)))
+
+
+class ParsedResume:
+    __slots__ = ("digest", "text", "profile")
+
+    def __init__(self, digest, text, profile):
+        self.digest, self.text, self.profile = digest, text, profile
+
+
+class ResumeIngestor:
+    """Turns uploaded resume bytes into normalized text and a token profile, once per content.
+
+    Results are keyed by the SHA-256 of the bytes and kept in an in-memory LRU of
+    `max_entries`, so re-uploads and reruns of the same file skip parsing. PDFs with
+    at least `parallel_min_pages` pages are extracted in page ranges on a process
+    pool (started on first use); smaller ones, or any PDF on a single-CPU host, are
+    faster to extract in-process.
+    """
+
+    def __init__(self, max_entries=256, parallel_min_pages=24, max_workers=None):
+        self.max_entries = max_entries
+        self.parallel_min_pages = parallel_min_pages
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._pool = None
+
+    def ingest(self, data, is_pdf):
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            parsed = self._entries.get(digest)
+            if parsed is not None:
+                self._entries.move_to_end(digest)
+                count("resume_cache.hit")
+                return parsed
+        count("resume_cache.miss")
+        with span("resume.extract"): raw = self._extract_pdf(data) if is_pdf else data.decode("utf-8", errors="replace")
+        with span("resume.profile"):
+            text = normalize_resume_text(raw)
+            parsed = ParsedResume(digest, text, ResumeProfile(text))
+        with self._lock:
+            self._entries[digest] = parsed
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+        return parsed
+
+    def _extract_pdf(self, data):
+        import PyPDF2
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        n_pages = len(reader.pages)
+        if n_pages < self.parallel_min_pages or self.max_workers < 2:
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+        from concurrent.futures.process import BrokenProcessPool
+        step = -(-n_pages // self.max_workers)
+        try:
+            futures = [self._get_pool().submit(_extract_pages, data, start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+            return "\n".join(text for future in futures for text in future.result())
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool next time and finish in-process
+            count("resume.pool_broken")
+            self.shutdown()
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # spawn, not fork: the app process runs Streamlit's server and worker threads
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None: self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,223 @@
+# telemetry.py
+
+import atexit
+import collections
+import contextlib
+import contextvars
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_request_id = contextvars.ContextVar("joblens_request_id", default=None)
+
+
+def new_request_id(kind):
+    return f"{kind}-{uuid.uuid4().hex[:12]}"
+
+
+def current_request_id():
+    return _request_id.get()
+
+
+@contextlib.contextmanager
+def request_context(request_id):
+    """Tag every span recorded in this context with `request_id`.
+
+    The ID follows the code through the HTTP engine loop (run_coroutine_threadsafe
+    copies the caller's context) and through thread pools that submit work via
+    `contextvars.copy_context().run`.
+    """
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+class _Span:
+    # A plain class rather than @contextmanager, which adds a generator per span
+    __slots__ = ("telemetry", "stage", "started")
+
+    def __init__(self, telemetry, stage):
+        self.telemetry = telemetry
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.telemetry.record(self.stage, time.perf_counter() - self.started, exc_type is None)
+
+
+class Telemetry:
+    """In-process timed spans and counters for the scrape and analysis stages.
+
+    Each finished span is one tuple appended to a bounded deque, which is the ring
+    buffer that percentiles, per-request breakdowns and JSONL export read from.
+    Per-stage bucket counts are kept since process start for the Prometheus
+    histogram. Recording a span costs two perf_counter calls and a deque append
+    plus a bucket increment under a short lock, so it can stay on in production.
+    """
+
+    def __init__(self, capacity=20000):
+        self.capacity = capacity
+        self._spans = collections.deque(maxlen=capacity)  # (seq, ended_at, stage, seconds, request_id, ok)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}  # stage -> [bucket counts (last one is +Inf), total seconds, errors]
+        self._exported_seq = 0
+        self._exporter = None
+        self._metrics_server = None
+
+    # --- Recording ---
+    def record(self, stage, seconds, ok=True):
+        request_id, bucket = _request_id.get(), bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            # Appending under the lock keeps sequence numbers in buffer order for incremental export
+            self._spans.append((next(self._seq), time.time(), stage, seconds, request_id, ok))
+            histogram = self._histograms.get(stage)
+            if histogram is None: histogram = self._histograms[stage] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0]
+            histogram[0][bucket] += 1
+            histogram[1] += seconds
+            if not ok: histogram[2] += 1
+
+    def span(self, stage):
+        # A span that exits with an exception is recorded with ok=False
+        return _Span(self, stage)
+
+    def count(self, name, value=1):
+        if value:
+            with self._lock: self._counters[name] = self._counters.get(name, 0) + value
+
+    # --- Reading ---
+    def spans(self, stage=None, window_seconds=None, request_id=None):
+        return [{"seq": seq, "ended_at": ended_at, "stage": span_stage, "seconds": seconds, "request_id": span_request, "ok": ok}
+                for seq, ended_at, span_stage, seconds, span_request, ok in self._recent(window_seconds)
+                if (stage is None or span_stage == stage) and (request_id is None or span_request == request_id)]
+
+    def _recent(self, window_seconds=None):
+        with self._lock: buffered = list(self._spans)
+        if not window_seconds: return buffered
+        cutoff = time.time() - window_seconds
+        return [span for span in buffered if span[1] >= cutoff]
+
+    def counters(self):
+        with self._lock: return dict(self._counters)
+
+    def stage_summary(self, window_seconds=None):
+        """Per-stage count, error count and p50/p95/p99/max in ms over the ring buffer."""
+        import numpy as np  # Only the admin panel reads percentiles; recording must not pay for numpy
+        durations, errors = collections.defaultdict(list), collections.Counter()
+        for _, _, stage, seconds, _, ok in self._recent(window_seconds):
+            durations[stage].append(seconds)
+            if not ok: errors[stage] += 1
+        summary = {}
+        for stage in sorted(durations):
+            values = np.array(durations[stage]) * 1000
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            summary[stage] = {"count": len(values), "errors": errors[stage], "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1), "max_ms": round(values.max(), 1)}
+        return summary
+
+    def histogram(self, stage, window_seconds=None):
+        """(bucket label, span count) pairs for one stage over the ring buffer, in bucket order."""
+        counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        for _, _, span_stage, seconds, _, _ in self._recent(window_seconds):
+            if span_stage == stage: counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        labels = [f"≤{bound * 1000:g} ms" if bound < 1 else f"≤{bound:g} s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]:g} s"]
+        return list(zip(labels, counts))
+
+    def requests(self, limit=20):
+        """Most recent correlated requests with their wall time and time spent per stage."""
+        by_request = {}
+        for span in self.spans():
+            if span["request_id"] is None: continue
+            entry = by_request.setdefault(span["request_id"], {"request_id": span["request_id"], "started_at": span["ended_at"] - span["seconds"], "ended_at": span["ended_at"], "spans": 0, "stages": collections.Counter()})
+            entry["started_at"] = min(entry["started_at"], span["ended_at"] - span["seconds"])
+            entry["ended_at"] = max(entry["ended_at"], span["ended_at"])
+            entry["spans"] += 1
+            entry["stages"][span["stage"]] += span["seconds"]
+        recent = sorted(by_request.values(), key=lambda entry: entry["ended_at"], reverse=True)[:limit]
+        return [{**entry, "seconds": entry["ended_at"] - entry["started_at"], "stages": dict(entry["stages"])} for entry in recent]
+
+    # --- Export ---
+    def to_prometheus(self, prefix="joblens"):
+        with self._lock:
+            histograms = {stage: (list(buckets), total, errors) for stage, (buckets, total, errors) in self._histograms.items()}
+            counters = dict(self._counters)
+        lines = [f"# HELP {prefix}_stage_duration_seconds Time spent per pipeline stage.", f"# TYPE {prefix}_stage_duration_seconds histogram"]
+        for stage, (buckets, total, _) in sorted(histograms.items()):
+            for bound, cumulative in zip(LATENCY_BUCKETS + ("+Inf",), itertools.accumulate(buckets)):
+                lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {sum(buckets)}')
+        lines += [f"# HELP {prefix}_stage_errors_total Spans that ended with an exception.", f"# TYPE {prefix}_stage_errors_total counter"]
+        lines += [f'{prefix}_stage_errors_total{{stage="{stage}"}} {errors}' for stage, (_, _, errors) in sorted(histograms.items())]
+        lines += [f"# HELP {prefix}_events_total Cache hits/misses, retries and other counted events.", f"# TYPE {prefix}_events_total counter"]
+        lines += [f'{prefix}_events_total{{event="{name}"}} {value}' for name, value in sorted(counters.items())]
+        return "\n".join(lines) + "\n"
+
+    def to_jsonl(self, since_seq=0):
+        return "".join(json.dumps(span) + "\n" for span in self.spans() if span["seq"] > since_seq)
+
+    def export_jsonl(self, path):
+        # Appends spans recorded since the previous export; spans evicted from the ring buffer in between are lost
+        with self._lock: since = self._exported_seq
+        spans = [span for span in self.spans() if span["seq"] > since]
+        if not spans: return 0
+        with open(path, "a", encoding="utf-8") as f:
+            for span in spans: f.write(json.dumps(span) + "\n")
+        with self._lock: self._exported_seq = spans[-1]["seq"]
+        return len(spans)
+
+    def start_jsonl_export(self, path, interval=5.0):
+        if self._exporter is not None: return
+        stop = threading.Event()
+
+        def export_loop():
+            while not stop.wait(interval):
+                try: self.export_jsonl(path)
+                except OSError: logger.exception("Span export to %s failed", path)
+
+        self._exporter = threading.Thread(target=export_loop, name="telemetry-jsonl", daemon=True)
+        self._exporter.start()
+        atexit.register(lambda: (stop.set(), self.export_jsonl(path)))
+
+    def serve_prometheus(self, port, host="0.0.0.0"):
+        """Serve `to_prometheus()` at http://host:port/metrics on a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        if self._metrics_server is not None: return self._metrics_server
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args): pass
+
+            def do_GET(self):
+                body = telemetry.to_prometheus().encode("utf-8") if self.path.split("?")[0] == "/metrics" else b""
+                self.send_response(200 if body else 404)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._metrics_server = ThreadingHTTPServer((host, port), Handler)
+        self._metrics_server.daemon_threads = True
+        threading.Thread(target=self._metrics_server.serve_forever, name="telemetry-metrics", daemon=True).start()
+        return self._metrics_server
+
+
+# One recorder per process, shared by every module and Streamlit session
+TELEMETRY = Telemetry()
+span = TELEMETRY.span
+count = TELEMETRY.count
+record = TELEMETRY.record
@@ -0,0 +1,31 @@
+# vocabulary.py
+
+import re
+
+# Keeps tech tokens such as c++, c#, node.js and ci/cd intact
+TOKEN_PATTERN = r"[a-z][a-z0-9+#./-]*[a-z0-9+#]|[a-z]"
+
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does doing
+during each etc few for from further had has have having he her here hers how i if in into is it its just
+me more most must my no nor not now of off on once only or other our ours out over own per same she should
+so some such than that the their them then there these they this those through to too under until up us
+very via was we well were what when where which while who whom why will with within without would you your
+role team work working job company including experience years strong ability skills new across join
+""".split())
+
+SKILL_KEYWORDS = frozenset("""
+python r sql java scala go golang rust c c++ c# javascript typescript node.js react angular vue html css
+bash linux git docker kubernetes terraform ansible jenkins ci/cd aws azure gcp airflow dbt spark hadoop
+kafka flink snowflake databricks bigquery redshift postgresql mysql mongodb redis elasticsearch tableau
+looker powerbi excel pandas numpy scipy scikit-learn sklearn pytorch tensorflow keras xgboost lightgbm
+huggingface transformers llm llms nlp mlops ml ai statistics regression forecasting experimentation a/b
+fastapi flask django graphql rest microservices agile scrum jira figma
+""".split())
+
+_TOKEN_RE = re.compile(TOKEN_PATTERN)
+
+
+def tokenize(text):
+    # The same tokens ranking.rank_jobs extracts from a document, without pandas
+    return [token for token in _TOKEN_RE.findall((text or "").lower()) if token not in STOP_WORDS]